@@ -1,10 +1,24 @@
 # alert_system_rest.py - Fully debug-ready with parallel calls and boosted Twilio audio volume
+import os
+import queue
+import threading
 import time
+import uuid
+import numpy as np
 from PyQt6.QtCore import QObject, QTimer, pyqtSignal
 from twilio.rest import Client
+from twilio.http.http_client import TwilioHttpClient
 import requests
+from requests.adapters import HTTPAdapter
 from concurrent.futures import ThreadPoolExecutor
 
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    import json
+    _json_loads = json.loads
+
 FIREBASE_DB_URL = "https://ai-rockfall-alert-system-default-rtdb.firebaseio.com/"
 TWILIO_CONFIG = {
     "account_sid": "hidden",
@@ -12,6 +26,16 @@ TWILIO_CONFIG = {
     "phone_number": "hidden"
 }
 
+# Twilio calls are network-bound, so the pool is sized well past the core
+# count; override with ALERT_MAX_PARALLEL_CALLS. Not meant for CPU-bound work.
+MAX_PARALLEL_CALLS = int(os.environ.get("ALERT_MAX_PARALLEL_CALLS", max(32, (os.cpu_count() or 1) * 5)))
+
+# A region claim left behind by a crashed instance is ignored after this long
+ALERT_CLAIM_TTL = 3600
+
+# Per-region tick output is only printed when ALERT_DEBUG=1
+ALERT_DEBUG = os.environ.get("ALERT_DEBUG", "0") == "1"
+
 # Default per-region messages
 REGION_MESSAGES = {
     "Central": "Attention! Central region alert! Please evacuate fastly!",
@@ -26,14 +50,50 @@ REGION_MESSAGES = {
     "Unknown": "Attention! Unknown region alert! Please evacuate fastly!"
 }
 
+# SSML for maximum volume (+6dB) and strong emphasis
+TWIML_TEMPLATE = '''
+<Response>
+    <Say voice="Polly.Matthew">
+        <prosody volume="+6dB" rate="95%">
+            <emphasis level="strong">Attention!</emphasis> {message}
+        </prosody>
+    </Say>
+</Response>
+'''
+
+
+# Poll interval (ms) by highest observed region risk: poll fast while a
+# region approaches the 80% alert threshold, back off when everything is calm
+POLL_INTERVALS_MS = ((70, 2000), (30, 10000))
+IDLE_POLL_INTERVAL_MS = 60000
+
+
+def poll_interval_for(max_risk):
+    for threshold, interval in POLL_INTERVALS_MS:
+        if max_risk > threshold:
+            return interval
+    return IDLE_POLL_INTERVAL_MS
+
+
+def build_twiml(message):
+    return TWIML_TEMPLATE.format(message=message)
+
+
+# The default messages are static, so their TwiML is rendered once at import
+REGION_TWIML = {region: build_twiml(msg) for region, msg in REGION_MESSAGES.items()}
+
 
 class AlertSystem(QObject):
     alert_triggered = pyqtSignal(str, str, float)
     call_initiated = pyqtSignal(str, str, str)
     error_occurred = pyqtSignal(str, str)
+    poll_interval_changed = pyqtSignal(int)
 
-    def __init__(self):
+    def __init__(self, max_parallel_calls=MAX_PARALLEL_CALLS, debug=ALERT_DEBUG):
         super().__init__()
+        self.debug = debug
+        # Identifies this app instance when claiming region alerts in Firebase
+        self.instance_id = uuid.uuid4().hex
         try:
             self.firebase = FirebaseManager(FIREBASE_DB_URL)
         except Exception as e:
@@ -41,13 +101,26 @@ class AlertSystem(QObject):
             self.firebase = None
 
         try:
-            self.twilio = TwilioManager()
+            self.twilio = TwilioManager(self.firebase)
         except Exception as e:
             print(f"Failed to initialize TwilioManager: {e}")
             self.twilio = None
 
+        # Firebase and Twilio calls are blocking, so each tick runs on a worker
+        # thread; signals emitted there are queued back to the GUI thread
+        self._tick_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="alert-tick")
+        self._tick_in_flight = False
+
+        # Employee calls share one pool for the lifetime of the alert system
+        # instead of spinning up fresh threads on every alert
+        self.max_workers = max(1, int(max_parallel_calls))
+        self._call_pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="alert-call")
+
         self.timer = QTimer()
-        self.timer.timeout.connect(self.check_alerts)
+        self.timer.timeout.connect(self.schedule_check)
+        # check_alerts runs on the tick worker; the interval update is queued
+        # back to the timer's (GUI) thread
+        self.poll_interval_changed.connect(self.timer.setInterval)
         self.is_monitoring = False
         self.sent_alerts = set()
         self.current_risks = {}
@@ -55,8 +128,9 @@ class AlertSystem(QObject):
     def start_monitoring(self):
         try:
             self.is_monitoring = True
-            self.timer.start(10000)
-            print("Alert system started - monitoring every second")
+            interval = poll_interval_for(max(self.current_risks.values(), default=0))
+            self.timer.start(interval)
+            print(f"Alert system started - polling every {interval / 1000:.0f}s (adapts to risk)")
         except Exception as e:
             print(f"Failed to start monitoring: {e}")
 
@@ -68,6 +142,33 @@ class AlertSystem(QObject):
         except Exception as e:
             print(f"Failed to stop monitoring: {e}")
 
+    def shutdown(self):
+        """Stop monitoring and release the worker threads"""
+        self.stop_monitoring()
+        self._tick_pool.shutdown(wait=False)
+        self._call_pool.shutdown(wait=False)
+        if self.firebase:
+            self.firebase.close()
+
+    def schedule_check(self):
+        """Hand the next check_alerts tick to the worker thread"""
+        if not self.is_monitoring:
+            return
+        # A slow Firebase/Twilio round may outlast the timer interval; drop
+        # the new tick rather than queueing duplicates behind it
+        if self._tick_in_flight:
+            if self.debug:
+                print("[CHECK] Previous tick still running, skipping")
+            return
+        self._tick_in_flight = True
+        self._tick_pool.submit(self._run_tick)
+
+    def _run_tick(self):
+        try:
+            self.check_alerts()
+        finally:
+            self._tick_in_flight = False
+
     def check_alerts(self):
         if not self.is_monitoring:
             return
@@ -75,44 +176,96 @@ class AlertSystem(QObject):
             print("Alert system not fully initialized.")
             return
         try:
-            regions = self.firebase.get_regions_data()
+            regions = self.firebase.get_regions_data(if_changed=True)
+            if regions is None:
+                # Same ETag as the previous tick - nothing to re-evaluate
+                return
             if not regions:
                 print("No regions data found in Firebase")
                 return
 
-            for region, data in regions.items():
+            # Employees and messages are fetched once per tick, and only if
+            # some region actually needs an alert
+            employees_by_region = None
+            messages = None
+
+            names = list(regions.keys())
+            risks = np.fromiter((self._parse_risk(region, data) for region, data in regions.items()),
+                                dtype=np.float64, count=len(names))
+            already_sent = np.fromiter((region in self.sent_alerts for region in names),
+                                       dtype=bool, count=len(names))
+
+            self.current_risks.update(zip(names, risks.tolist()))
+            if self.debug:
+                for region, risk in zip(names, risks.tolist()):
+                    print(f"[CHECK] Region: {region}, Risk: {risk}")
+
+            # Threshold every region at once; only the (usually empty) hits
+            # are walked in Python
+            to_alert = np.flatnonzero((risks > 80) & ~already_sent)
+            to_clear = np.flatnonzero((risks <= 5) & already_sent)
+            if self.debug or len(to_alert) or len(to_clear):
+                print(f"[CHECK] {len(names)} regions: {len(to_alert)} new high-risk, "
+                      f"{len(to_clear)} recovered, {len(names) - len(to_alert) - len(to_clear)} unchanged")
+
+            for i in to_alert:
+                region, risk = names[i], float(risks[i])
+                # sent_alerts only covers this process; the Firebase claim
+                # keeps other running instances from calling the same region
+                if not self.firebase.try_claim_alert(region, self.instance_id):
+                    print(f"[ALERT] {region} already claimed by another instance, skipping")
+                    self.sent_alerts.add(region)
+                    continue
+                print(f"[ALERT] Triggering alert for {region} with risk {risk}")
                 try:
-                    risk = float(data.get('risk_percentage', 0))
-                except (ValueError, TypeError) as e:
-                    print(f"Error parsing risk for region {region}: {e}")
-                    risk = 0
-
-                self.current_risks[region] = risk
-                print(f"[CHECK] Region: {region}, Risk: {risk}")
-
-                if risk > 80 and region not in self.sent_alerts:
-                    print(f"[ALERT] Triggering alert for {region} with risk {risk}")
-                    try:
-                        self.trigger_alert(region, risk)
-                        self.sent_alerts.add(region)
-                    except Exception as e:
-                        print(f"Error triggering alert for {region}: {e}")
-
-                elif risk <= 5 and region in self.sent_alerts:
-                    print(f"[INFO] Risk for {region} dropped to {risk}%, resetting alert status")
-                    self.sent_alerts.discard(region)
+                    if employees_by_region is None:
+                        employees_by_region = self.firebase.get_all_employees_indexed()
+                        messages = self.firebase.get_all_messages()
+                    self.trigger_alert(region, risk,
+                                       employees_by_region.get(region, []),
+                                       messages.get(region))
+                    self.sent_alerts.add(region)
+                except Exception as e:
+                    print(f"Error triggering alert for {region}: {e}")
+                    # Re-evaluate next tick even if the data is unchanged
+                    self.firebase.invalidate_regions()
+
+            for i in to_clear:
+                region = names[i]
+                print(f"[INFO] Risk for {region} dropped to {float(risks[i])}%, resetting alert status")
+                self.sent_alerts.discard(region)
+                self.firebase.release_alert(region)
+
+            self._adapt_poll_interval()
 
         except Exception as e:
             print(f"Error in check_alerts: {e}")
             self.error_occurred.emit("Check Alerts", str(e))
 
-    def trigger_alert(self, region, risk):
+    def _adapt_poll_interval(self):
+        interval = poll_interval_for(max(self.current_risks.values(), default=0))
+        if interval != self.timer.interval():
+            if self.debug:
+                print(f"[CHECK] Poll interval -> {interval / 1000:.0f}s")
+            self.poll_interval_changed.emit(interval)
+
+    @staticmethod
+    def _parse_risk(region, data):
+        try:
+            return float(data.get('risk_percentage', 0))
+        except (AttributeError, ValueError, TypeError) as e:
+            print(f"Error parsing risk for region {region}: {e}")
+            return 0.0
+
+    def trigger_alert(self, region, risk, employees=None, message=None):
         if not self.firebase or not self.twilio:
             print("Cannot trigger alert, managers not initialized.")
             return
 
         try:
-            employees = self.firebase.get_employees_by_region(region)
+            if employees is None:
+                employees = self.firebase.get_employees_by_region(region)
+                message = self.firebase.get_custom_message(region)
             if not employees:
                 print(f"No employees found for region: {region}")
                 return
@@ -120,6 +273,14 @@ class AlertSystem(QObject):
             print(f"Failed to fetch employees for region {region}: {e}")
             return
 
+        # Render the spoken message once per alert; only the per-name
+        # fallback for unknown regions has to be built per employee
+        if message:
+            region_twiml = build_twiml(message)
+        else:
+            message = REGION_MESSAGES.get(region)
+            region_twiml = REGION_TWIML.get(region)
+
         def call_employee(emp):
             name = emp.get('name', 'Employee')
             phone = emp.get('phone', '')
@@ -127,8 +288,10 @@ class AlertSystem(QObject):
                 print(f"Calling {name} at {phone} for region {region}")
                 self.alert_triggered.emit(region, name, risk)
                 try:
-                    message = self.firebase.get_custom_message(region) or REGION_MESSAGES.get(region, f"Attention {name}, {region} is at risk! Please evacuate fastly!")
-                    call_sid = self.twilio.make_call(phone, message)
+                    if message:
+                        call_sid = self.twilio.make_call(phone, message, region_twiml)
+                    else:
+                        call_sid = self.twilio.make_call(phone, f"Attention {name}, {region} is at risk! Please evacuate fastly!")
                     if call_sid:
                         self.call_initiated.emit(name, phone, call_sid)
                 except Exception as e:
@@ -136,102 +299,235 @@ class AlertSystem(QObject):
             else:
                 print(f"No phone number for employee {name} in region {region}")
 
-        # Call employees in parallel (up to 4 simultaneous calls)
-        with ThreadPoolExecutor(max_workers=4) as executor:
-            executor.map(call_employee, employees)
+        # Call employees in parallel (up to max_workers simultaneous calls)
+        list(self._call_pool.map(call_employee, employees))
 
     def reset_alerts(self):
         self.sent_alerts.clear()
+        if self.firebase:
+            self.firebase.clear_cache()
         print("All alerts reset - system will send new alerts for high-risk regions")
 
 
 class FirebaseManager:
     def __init__(self, db_url):
         self.db_url = db_url if db_url.endswith('/') else db_url + '/'
+
+        # One keep-alive session for every REST call so each poll reuses the
+        # pooled TLS connection instead of opening a new one
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=16))
+        self.session.headers["Connection"] = "keep-alive"
+
+        # Employee directory and custom messages rarely change, so they are
+        # kept for cache_ttl seconds; region risk data is never cached
+        self.cache_ttl = 60
+        self._cache = {}
+        self._regions_etag = None
+
+        # Alert logs are written by a background thread so a Firebase POST
+        # never sits between two Twilio calls
+        self._log_queue = queue.Queue()
+        self._log_thread = threading.Thread(target=self._log_writer, name="alert-log", daemon=True)
+        self._log_thread.start()
         print("FirebaseManager initialized.")
 
-    def get_employees_by_region(self, region):
+    def _cached(self, key, fetch):
+        now = time.monotonic()
+        entry = self._cache.get(key)
+        if entry and now - entry[0] < self.cache_ttl:
+            return entry[1]
+        value = fetch()
+        if value:
+            self._cache[key] = (now, value)
+        return value
+
+    def clear_cache(self):
+        self._cache.clear()
+        self.invalidate_regions()
+
+    def invalidate_regions(self):
+        """Forget the last regions ETag so the next poll is fully processed"""
+        self._regions_etag = None
+
+    def get_all_employees_indexed(self):
+        """Fetch the whole employee directory in one GET, grouped by region"""
+        return self._cached("employees", self._fetch_employees_indexed)
+
+    def _fetch_employees_indexed(self):
         try:
             url = f"{self.db_url}employees.json"
-            params = {"orderBy": '"region"', "equalTo": f'"{region}"'}
-            print(f"[DEBUG] Firebase request URL: {url} with params {params}")
-            res = requests.get(url, params=params)
+            res = self.session.get(url)
             res.raise_for_status()
-            data = res.json()
-            return list(data.values()) if data else []
-        except requests.exceptions.RequestException as e:
-            print(f"[ERROR] Firebase request failed for region {region}: {e}")
-            return []
+            data = _json_loads(res.content) or {}
+        except (requests.exceptions.RequestException, ValueError) as e:
+            print(f"[ERROR] Employees fetch failed: {e}")
+            return {}
+
+        by_region = {}
+        for emp in data.values():
+            if isinstance(emp, dict):
+                by_region.setdefault(emp.get('region', 'Unknown'), []).append(emp)
+        return by_region
+
+    def get_employees_by_region(self, region):
+        return self.get_all_employees_indexed().get(region, [])
 
-    def get_regions_data(self):
+    def get_regions_data(self, if_changed=False):
+        """Fetch region risk data; with if_changed, return None when the
+        ETag matches the previous poll so callers can skip the work"""
         try:
             url = f"{self.db_url}regions.json"
-            res = requests.get(url)
+            headers = {"X-Firebase-ETag": "true"}
+            if if_changed and self._regions_etag:
+                headers["If-None-Match"] = self._regions_etag
+            res = self.session.get(url, headers=headers)
+            if res.status_code == 304:
+                return None
             res.raise_for_status()
-            return res.json() or {}
-        except requests.exceptions.RequestException as e:
+            etag = res.headers.get("ETag")
+            if if_changed and etag and etag == self._regions_etag:
+                return None
+            self._regions_etag = etag
+            return _json_loads(res.content) or {}
+        except (requests.exceptions.RequestException, ValueError) as e:
             print(f"[ERROR] Regions fetch failed: {e}")
             return {}
 
+    def get_all_messages(self):
+        """Fetch every per-region custom message in one GET"""
+        return self._cached("messages", self._fetch_messages)
+
+    def _fetch_messages(self):
+        try:
+            url = f"{self.db_url}messages.json"
+            res = self.session.get(url)
+            res.raise_for_status()
+            messages = _json_loads(res.content) or {}
+            if ALERT_DEBUG:
+                print(f"[DEBUG] Custom messages: {messages}")
+            return messages if isinstance(messages, dict) else {}
+        except Exception as e:
+            print(f"[ERROR] Failed to fetch custom messages: {e}")
+            return {}
+
     def get_custom_message(self, region):
+        return self.get_all_messages().get(region)
+
+    def try_claim_alert(self, region, owner):
+        """Atomically mark region as alerted by owner using an ETag-guarded PUT.
+
+        Returns False if another live instance holds the claim or wins the
+        race (HTTP 412). Network errors fail open so an alert is never lost.
+        """
+        url = f"{self.db_url}alert_state/{region}.json"
         try:
-            url = f"{self.db_url}messages/{region}.json"
-            res = requests.get(url)
+            res = self.session.get(url, headers={"X-Firebase-ETag": "true"})
             res.raise_for_status()
-            msg = res.json()
-            print(f"[DEBUG] Custom message for {region}: {msg}")
-            return msg
+            state = _json_loads(res.content)
+            if isinstance(state, dict) and state.get("owner") not in (None, owner):
+                if time.time() - float(state.get("claimed_at", 0)) < ALERT_CLAIM_TTL:
+                    return False
+
+            claim = {"owner": owner, "claimed_at": time.time()}
+            res = self.session.put(url, json=claim, headers={"if-match": res.headers.get("ETag", "")})
+            if res.status_code == 412:
+                return False
+            res.raise_for_status()
+            return True
         except Exception as e:
-            print(f"[ERROR] Failed to fetch custom message for {region}: {e}")
-            return None
+            print(f"[ERROR] Failed to claim alert for {region}: {e}")
+            return True
+
+    def release_alert(self, region):
+        try:
+            res = self.session.delete(f"{self.db_url}alert_state/{region}.json")
+            res.raise_for_status()
+        except Exception as e:
+            print(f"[ERROR] Failed to release alert for {region}: {e}")
 
     def log_alert(self, data):
+        """Queue an alert log entry; the writer thread posts it to Firebase"""
+        data["timestamp"] = time.strftime("%Y-%m-%d %H:%M:%S")
+        self._log_queue.put_nowait(data)
+
+    def close(self, timeout=5.0):
+        """Flush queued alert logs and stop the writer thread"""
+        self._log_queue.put(None)
+        self._log_thread.join(timeout=timeout)
+
+    def _log_writer(self):
+        while True:
+            batch = [self._log_queue.get()]
+            while True:
+                try:
+                    batch.append(self._log_queue.get_nowait())
+                except queue.Empty:
+                    break
+            # None is the close() sentinel: write what queued up before it, then exit
+            entries = [entry for entry in batch if entry is not None]
+            if entries:
+                self._write_logs(entries)
+            if len(entries) != len(batch):
+                return
+
+    def _write_logs(self, batch):
+        # One multi-child PATCH for everything that queued up meanwhile
         try:
-            data["timestamp"] = time.strftime("%Y-%m-%d %H:%M:%S")
+            stamp = time.time_ns()
+            updates = {f"log_{stamp}_{i}": entry for i, entry in enumerate(batch)}
             url = f"{self.db_url}alert_logs.json"
-            res = requests.post(url, json=data)
+            res = self.session.patch(url, json=updates)
             res.raise_for_status()
-            print(f"[DEBUG] Logged alert to Firebase: {data}")
+            print(f"[DEBUG] Logged {len(batch)} alert(s) to Firebase: {batch}")
         except Exception as e:
             print(f"[ERROR] Failed to log alert: {e}")
 
 
+_twilio_client = None
+
+
+def get_twilio_client():
+    """Process-wide Twilio client whose HTTP session keeps pooled connections"""
+    global _twilio_client
+    if _twilio_client is None:
+        _twilio_client = Client(
+            TWILIO_CONFIG["account_sid"], TWILIO_CONFIG["auth_token"],
+            http_client=TwilioHttpClient(pool_connections=True)
+        )
+    return _twilio_client
+
+
 class TwilioManager:
-    def __init__(self):
+    def __init__(self, firebase=None):
+        self.firebase = firebase
         try:
-            self.client = Client(TWILIO_CONFIG["account_sid"], TWILIO_CONFIG["auth_token"])
+            self.client = get_twilio_client()
             self.from_number = TWILIO_CONFIG["phone_number"]
             print("TwilioManager initialized.")
         except Exception as e:
             print(f"Failed to initialize TwilioManager: {e}")
             self.client = None
 
-    def make_call(self, to, message):
+    def make_call(self, to, message, twiml=None):
         if not self.client:
             print("Twilio client not initialized.")
             return None
         try:
-            # Use SSML for maximum volume (+6dB) and strong emphasis
-            twiml = f'''
-<Response>
-    <Say voice="Polly.Matthew">
-        <prosody volume="+6dB" rate="95%">
-            <emphasis level="strong">Attention!</emphasis> {message}
-        </prosody>
-    </Say>
-</Response>
-'''
+            if twiml is None:
+                twiml = build_twiml(message)
             call = self.client.calls.create(
                 to=to,
                 from_=self.from_number,
                 twiml=twiml
             )
-            FirebaseManager(FIREBASE_DB_URL).log_alert({
-                "type": "voice_call",
-                "phone_number": to,
-                "message": message,
-                "call_sid": call.sid
-            })
+            if self.firebase:
+                self.firebase.log_alert({
+                    "type": "voice_call",
+                    "phone_number": to,
+                    "message": message,
+                    "call_sid": call.sid
+                })
             print(f"[DEBUG] Call initiated successfully: {call.sid}")
             return call.sid
         except Exception as e:
@@ -128,7 +128,7 @@ class RockfallApp(QMainWindow):
 
         # Pages - Pass user info if needed
         self.home_page = HomePage()
-        self.dashboard_page = DashboardPage(self.sensors, self.risk_meter)
+        self.dashboard_page = DashboardPage([gauge for gauge, _ in self.sensors.values()], self.risk_meter)
         self.stress_page = StressAnalysisPage()
         self.simulation_page = SimulationPage()
         self.employee_page = EmployeePage()
@@ -235,7 +235,9 @@ class RockfallApp(QMainWindow):
     def closeEvent(self, event):
         """Cleanup on application close"""
         if hasattr(self, 'alert_system'):
-            self.alert_system.stop_monitoring()
+            self.alert_system.shutdown()
+        if hasattr(self, 'employee_page'):
+            self.employee_page.shutdown()
         event.accept()
 
 
@@ -277,6 +279,8 @@ def main():
     import sys
     from PyQt6.QtWidgets import QApplication
     
+    # Fractional scale factors pass through so cached pixmaps match the real DPR
+    QApplication.setHighDpiScaleFactorRoundingPolicy(Qt.HighDpiScaleFactorRoundingPolicy.PassThrough)
     app = QApplication(sys.argv)
     
     # Check for existing session
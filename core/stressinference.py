@@ -4,41 +4,154 @@
 
 import torch
 import torch.nn.functional as F
-from torch_geometric.data import Data
+from torch_geometric.data import Data, Batch
 from torch_geometric.nn import GraphConv, global_add_pool, global_mean_pool
 import trimesh
 import numpy as np
+import hashlib
+import inspect
 import os
-import math
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import faiss
+except ImportError:
+    faiss = None  # falls back to cuML / sklearn for kNN edges
+
+try:
+    from cuml.neighbors import NearestNeighbors as CuNearestNeighbors
+except ImportError:
+    CuNearestNeighbors = None
+
+try:
+    # Intel-accelerated drop-in for sklearn's NearestNeighbors
+    from sklearnex.neighbors import NearestNeighbors as SkNearestNeighbors
+except ImportError:
+    SkNearestNeighbors = None
+
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None  # ONNX export still works; inference stays in PyTorch
+
+try:
+    from torch_geometric import EdgeIndex
+except ImportError:
+    EdgeIndex = None  # torch_geometric < 2.5: plain COO edge_index
+
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None  # edge lists are packed with plain NumPy
+
+# Above this many vertices the FAISS kNN search switches from an exact flat
+# index to an inverted-file (IVF) index
+FAISS_IVF_MIN_VERTICES = 100_000
+
+# Meshes above this many vertices are inferred in neighbor-sampled mini-batches
+# (one fan-out per GraphConv hop) to bound device memory. Global attention then
+# only sees each sampled subgraph, an approximation of the full-mesh context.
+MINIBATCH_MIN_NODES = 1_000_000
+MINIBATCH_SIZE = 4096
+MINIBATCH_NUM_NEIGHBORS = [15, 10, 10]
+
+# torch >= 2.1: a model built on the meta device can adopt the loaded tensors
+# (load_state_dict(assign=True)); older releases construct on the CPU and copy
+META_INIT_SUPPORTED = "assign" in inspect.signature(torch.nn.Module.load_state_dict).parameters
+
+# Built edge indices are cached here, keyed by a hash of the mesh geometry.
+# Only the EDGE_CACHE_MAX_FILES most recently written entries are kept.
+EDGE_CACHE_DIR = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+                              "rockfall", "edges")
+EDGE_CACHE_MAX_FILES = 64
+# Part of every cache key; bump whenever build_mesh_edges produces different edges
+EDGE_CACHE_VERSION = 2
+
+if njit is not None:
+    @njit(parallel=True, cache=True)
+    def _pack_knn_edges(indices):
+        """[N, k] neighbor indices -> [2, E] edge list without self-loops or
+        -1 padding. Rows are counted, prefix-summed, then filled in parallel."""
+        n, k = indices.shape
+        counts = np.zeros(n, np.int64)
+        for i in prange(n):
+            c = 0
+            for j in range(k):
+                d = indices[i, j]
+                if d != i and d >= 0:
+                    c += 1
+            counts[i] = c
+        offsets = np.zeros(n + 1, np.int64)
+        offsets[1:] = np.cumsum(counts)
+        out = np.empty((2, offsets[n]), np.int64)
+        for i in prange(n):
+            pos = offsets[i]
+            for j in range(k):
+                d = indices[i, j]
+                if d != i and d >= 0:
+                    out[0, pos] = i
+                    out[1, pos] = d
+                    pos += 1
+        return out
+else:
+    _pack_knn_edges = None
 
 # ============================================
 # Model definition with Global Attention
 # ============================================
 
+# Above this many nodes exact attention is replaced by linear attention
+LINEAR_ATTENTION_MIN_NODES = 4096
+
 class GlobalAttentionLayer(torch.nn.Module):
-    def __init__(self, hidden_dim):
+    def __init__(self, hidden_dim, linear_min_nodes=LINEAR_ATTENTION_MIN_NODES):
         super().__init__()
         self.hidden_dim = hidden_dim
+        self.linear_min_nodes = linear_min_nodes
         self.query = torch.nn.Linear(hidden_dim, hidden_dim)
         self.key = torch.nn.Linear(hidden_dim, hidden_dim)
         self.value = torch.nn.Linear(hidden_dim, hidden_dim)
-        self.softmax = torch.nn.Softmax(dim=-1)
         
-    def forward(self, x):
+    def forward(self, x, batch=None):
         # x: [num_nodes, hidden_dim]
         Q = self.query(x)  # [num_nodes, hidden_dim]
         K = self.key(x)    # [num_nodes, hidden_dim]  
         V = self.value(x)  # [num_nodes, hidden_dim]
         
-        # Compute attention scores: every node with every other node
-        attention_scores = torch.matmul(Q, K.transpose(0, 1)) / math.sqrt(self.hidden_dim)
-        attention_weights = self.softmax(attention_scores)  # [num_nodes, num_nodes]
+        if batch is not None:
+            # Several meshes in one batch: nodes only attend within their own mesh
+            sizes = torch.bincount(batch).tolist()
+            return torch.cat([
+                self._attend(q, k, v)
+                for q, k, v in zip(Q.split(sizes), K.split(sizes), V.split(sizes))
+            ], dim=0)
+        return self._attend(Q, K, V)
+
+    def _attend(self, Q, K, V):
+        if Q.size(0) > self.linear_min_nodes:
+            return self._linear_attention(Q, K, V)
         
-        # Apply attention to values
-        global_context = torch.matmul(attention_weights, V)  # [num_nodes, hidden_dim]
+        # Every node attends to every other node. SDPA computes
+        # softmax(Q K^T / sqrt(d)) V in one fused kernel (FlashAttention /
+        # memory-efficient on CUDA) without materializing the N x N matrix
+        global_context = F.scaled_dot_product_attention(
+            Q.unsqueeze(0), K.unsqueeze(0), V.unsqueeze(0)
+        ).squeeze(0)  # [num_nodes, hidden_dim]
         
         return global_context
 
+    def _linear_attention(self, Q, K, V):
+        """Kernelized attention with the elu(x)+1 feature map: O(N*d^2)
+        time and O(d^2) extra memory instead of an N x N score matrix.
+        Approximates softmax attention for meshes too large to attend exactly."""
+        Q = F.elu(Q) + 1
+        K = F.elu(K) + 1
+        KV = torch.matmul(K.transpose(0, 1), V)  # [hidden_dim, hidden_dim]
+        Z = torch.matmul(Q, K.sum(dim=0))         # [num_nodes]
+        return torch.matmul(Q, KV) / Z.unsqueeze(-1)
+
 class StabilityGNN(torch.nn.Module):
     def __init__(self, hidden_dim=128):
         super().__init__()
@@ -64,7 +177,7 @@ class StabilityGNN(torch.nn.Module):
         local_feat3 = F.relu(self.conv3(local_feat2, edge_index))
         
         # Get global context for each node
-        global_context = self.global_attention(local_feat3)
+        global_context = self.global_attention(local_feat3, batch)
         
         # Combine local and global features
         combined = torch.cat([local_feat3, global_context], dim=-1)
@@ -82,10 +195,34 @@ class StabilityGNN(torch.nn.Module):
 # ============================================
 
 class GNNAnalyzer:
-    def __init__(self, model_path="stability_gnn.pth"):
+    def __init__(self, model_path="stability_gnn.pth", compile_model=False, quantize=True, onnx_path=None,
+                 edge_cache_dir=EDGE_CACHE_DIR):
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         self.model = None
+        self.inference_model = None
+        self.compiled_model = None
+        self.session = None
+        self.edge_cache_dir = edge_cache_dir
+        self.compile_model = compile_model
+        self.quantize = quantize
+        # Reduced-precision forward on CUDA; CPU relies on int8 quantization
+        self.amp_dtype = None
+        if self.device.type == "cuda":
+            self.amp_dtype = torch.bfloat16 if torch.cuda.is_bf16_supported() else torch.float16
+        # Page-locked staging buffers (grown on demand) and a side stream so
+        # host-to-device copies are async and off the compute stream
+        self._pinned = {}
+        self._copy_stream = torch.cuda.Stream() if self.device.type == "cuda" else None
+        # Mesh loading + edge building (trimesh/NumPy/FAISS) runs here so it can
+        # overlap inference on another mesh; torch forward passes stay on the caller
+        self._prefetch_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="mesh-prefetch")
+        self._prefetched = {}
+        # FAISS GPU resources (temp memory pool + CUDA streams) are created once
+        # per thread and reused; StandardGpuResources is not thread-safe
+        self._faiss_local = threading.local()
         self.model_loaded = self.load_model(model_path)
+        if onnx_path and os.path.exists(onnx_path):
+            self.load_onnx_session(onnx_path)
         print(f"🚀 Using device: {self.device}")
     
     def load_model(self, model_path):
@@ -96,19 +233,34 @@ class GNNAnalyzer:
                 return False
             
             print(f"✅ Loading model from: {model_path}")
-            self.model = StabilityGNN(hidden_dim=128).to(self.device)
             
             # Handle both full model and state_dict saving
+            checkpoint = self._load_checkpoint(model_path)
             if model_path.endswith('.pth'):
-                checkpoint = torch.load(model_path, map_location=self.device)
                 if isinstance(checkpoint, dict) and 'model_state_dict' in checkpoint:
-                    self.model.load_state_dict(checkpoint['model_state_dict'])
+                    checkpoint = checkpoint['model_state_dict']
+                if META_INIT_SUPPORTED:
+                    # Parameters are created on the meta device (no allocation) and
+                    # then take over the loaded tensors instead of copying them
+                    with torch.device('meta'):
+                        self.model = StabilityGNN(hidden_dim=128)
+                    self.model.load_state_dict(checkpoint, assign=True)
                 else:
+                    self.model = StabilityGNN(hidden_dim=128)
                     self.model.load_state_dict(checkpoint)
             else:
-                self.model = torch.load(model_path, map_location=self.device)
+                self.model = checkpoint
             
-            self.model.eval()
+            self.model.to(self.device)
+            self.model.eval()  # once here; the inference paths never switch back to train mode
+            
+            # int8 dynamic quantization only pays off on CPU GEMMs
+            self.inference_model = self.model
+            if self.quantize and self.device.type == "cpu":
+                self.inference_model = self._quantize(self.model)
+            self.compiled_model = self._compile(self.inference_model) if self.compile_model else None
+            if self.compiled_model is not None:
+                self._warmup()
             print("✅ GNN model loaded successfully")
             return True
             
@@ -117,114 +269,444 @@ class GNNAnalyzer:
             self.model = None
             return False
 
+    def _load_checkpoint(self, model_path):
+        """Load onto the CPU, memory-mapping the file where supported, so a
+        CUDA load does not hold a full host copy and a device copy at once"""
+        try:
+            return torch.load(model_path, map_location='cpu', mmap=True)
+        except (TypeError, RuntimeError):
+            # torch < 2.1 or a legacy (non-zip) checkpoint
+            return torch.load(model_path, map_location='cpu')
+
+    def _quantize(self, model):
+        """Dynamically quantize the attention/fusion/output nn.Linear layers
+        to int8. GraphConv's PyG linears are untouched and stay FP32."""
+        try:
+            return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        except Exception as e:
+            print(f"⚠️ Dynamic quantization unavailable, using FP32 model: {e}")
+            return model
+
+    def _compile(self, model):
+        """Compile the model with dynamic node/edge counts (every mesh has its
+        own N and E). Returns None, meaning the eager model is used, when
+        torch.compile is missing or fails. Opt-in: compiling takes seconds up front."""
+        if not hasattr(torch, "compile"):
+            print("⚠️ torch.compile unavailable, using eager model")
+            return None
+        try:
+            return torch.compile(model, dynamic=True)
+        except Exception as e:
+            print(f"⚠️ torch.compile failed, using eager model: {e}")
+            return None
+
+    def _warmup(self):
+        """Run dummy graphs through the compiled model so compilation (and any
+        lazy compile failure) happens at load time, not on the first mesh.
+        The model is compiled with dynamic shapes, so one graph per attention
+        branch (exact below LINEAR_ATTENTION_MIN_NODES, linear above) covers
+        meshes of any size."""
+        for num_nodes in (16, LINEAR_ATTENTION_MIN_NODES + 1):
+            x = torch.zeros(num_nodes, 3, device=self.device)
+            edge_index = torch.zeros(2, num_nodes * 2, dtype=torch.long, device=self.device)
+            with torch.inference_mode(), self._autocast():
+                self._predict(x, edge_index)
+
+    def export_onnx(self, sample_data, path="stability_gnn.onnx"):
+        """Export the FP32 model to ONNX with dynamic node/edge counts and
+        switch inference to ONNX Runtime. The attention branch (exact vs
+        linear) is fixed by the size of sample_data at export time."""
+        if self.model is None:
+            raise ValueError("GNN model not loaded")
+        try:
+            sample_data = sample_data.cpu()
+            model = self.model.cpu()
+            torch.onnx.export(
+                model, (sample_data.x, sample_data.edge_index), path,
+                input_names=['x', 'edge_index'], output_names=['stress'],
+                opset_version=18,
+                dynamic_axes={'x': {0: 'N'}, 'edge_index': {1: 'E'}, 'stress': {0: 'N'}}
+            )
+            print(f"✅ Exported ONNX model to: {path}")
+        except Exception as e:
+            print(f"❌ ONNX export failed: {e}")
+            return False
+        finally:
+            self.model.to(self.device)
+        return self.load_onnx_session(path)
+
+    def load_onnx_session(self, path):
+        """Route inference through an ONNX Runtime session (CUDA EP when available)"""
+        if ort is None:
+            print("⚠️ onnxruntime not installed, keeping PyTorch inference")
+            return False
+        try:
+            available = ort.get_available_providers()
+            providers = [p for p in ('CUDAExecutionProvider', 'CPUExecutionProvider') if p in available]
+            self.session = ort.InferenceSession(path, providers=providers)
+            print(f"✅ ONNX Runtime session ready ({self.session.get_providers()[0]})")
+            return True
+        except Exception as e:
+            print(f"⚠️ Failed to load ONNX session, keeping PyTorch inference: {e}")
+            self.session = None
+            return False
+
+    def _autocast(self):
+        return torch.autocast(device_type=self.device.type,
+                              dtype=self.amp_dtype or torch.bfloat16,
+                              enabled=self.amp_dtype is not None)
+
+    def _predict(self, x, edge_index):
+        """Run the forward pass, preferring ONNX Runtime, then the compiled model.
+        torch.compile fails lazily (e.g. missing C++ toolchain), so a failed
+        first call permanently drops back to the eager model."""
+        if self.session is not None:
+            (stress,) = self.session.run(None, {'x': x.cpu().numpy(), 'edge_index': edge_index.cpu().numpy()})
+            return torch.from_numpy(stress).to(x.device)
+        if self.compiled_model is not None:
+            try:
+                return self.compiled_model(x, edge_index)
+            except Exception as e:
+                print(f"⚠️ Compiled model failed, falling back to eager: {e}")
+                self.compiled_model = None
+        return self.inference_model(x, self._adjacency(edge_index, x.size(0)))
+
+    @staticmethod
+    def _adjacency(edge_index, num_nodes):
+        """Tag the (destination-sorted) edge_index as a PyG EdgeIndex so
+        GraphConv aggregates with a CSR sparse-matrix multiply instead of an
+        atomic scatter-add over COO edges"""
+        if EdgeIndex is None:
+            return edge_index
+        return EdgeIndex(edge_index, sparse_size=(num_nodes, num_nodes), sort_order='col')
+
+    def _stage(self, name, tensor):
+        """Copy tensor into a reusable pinned buffer and return a view of it"""
+        buf = self._pinned.get(name)
+        if buf is None or buf.dtype != tensor.dtype or buf.numel() < tensor.numel():
+            buf = torch.empty(tensor.numel(), dtype=tensor.dtype, pin_memory=True)
+            self._pinned[name] = buf
+        staged = buf[:tensor.numel()].view(tensor.shape)
+        staged.copy_(tensor)
+        return staged
+
+    def _pin(self, mesh_data):
+        """Page-lock a freshly built graph on CUDA so _to_device can copy it
+        asynchronously straight from its own memory"""
+        if self._copy_stream is not None:
+            mesh_data.x = mesh_data.x.pin_memory()
+            mesh_data.edge_index = mesh_data.edge_index.pin_memory()
+        return mesh_data
+
+    def _to_device(self, mesh_data):
+        """Move graph tensors to self.device, asynchronously on CUDA"""
+        if self._copy_stream is None:
+            return mesh_data.to(self.device)
+        
+        # The previous transfer must finish before its staging buffers are reused
+        self._copy_stream.synchronize()
+        compute_stream = torch.cuda.current_stream()
+        with torch.cuda.stream(self._copy_stream):
+            # Graphs pinned at build time skip the staging copy
+            x = mesh_data.x if mesh_data.x.is_pinned() else self._stage("x", mesh_data.x)
+            edge_index = (mesh_data.edge_index if mesh_data.edge_index.is_pinned()
+                          else self._stage("edge_index", mesh_data.edge_index))
+            x = x.to(self.device, non_blocking=True)
+            edge_index = edge_index.to(self.device, non_blocking=True)
+        compute_stream.wait_stream(self._copy_stream)
+        x.record_stream(compute_stream)
+        edge_index.record_stream(compute_stream)
+        return Data(x=x, edge_index=edge_index)
+
+    def _knn_indices(self, vertices_np, k_neighbors):
+        """Indices of the k nearest neighbors of every vertex, [N, k]"""
+        if faiss is None:
+            if self.device.type == "cuda" and CuNearestNeighbors is not None:
+                points = np.ascontiguousarray(vertices_np, dtype=np.float32)
+                nbrs = CuNearestNeighbors(n_neighbors=k_neighbors).fit(points)
+                return np.asarray(nbrs.kneighbors(points, return_distance=False))
+            # oneDAL only accelerates brute / kd_tree; ball_tree would silently
+            # run stock sklearn, so it is kept for the plain-sklearn fallback
+            NearestNeighbors, algorithm = SkNearestNeighbors, 'kd_tree'
+            if NearestNeighbors is None:
+                from sklearn.neighbors import NearestNeighbors
+                algorithm = 'ball_tree'
+            nbrs = NearestNeighbors(n_neighbors=k_neighbors, algorithm=algorithm).fit(vertices_np)
+            return nbrs.kneighbors(vertices_np, return_distance=False)
+        
+        points = np.ascontiguousarray(vertices_np, dtype=np.float32)
+        n, dim = points.shape
+        if n > FAISS_IVF_MIN_VERTICES:
+            nlist = int(np.sqrt(n))
+            index = faiss.IndexIVFFlat(faiss.IndexFlatL2(dim), dim, nlist)
+            index.train(points)
+            index.nprobe = 8
+        else:
+            index = faiss.IndexFlatL2(dim)
+        if self.device.type == "cuda" and hasattr(faiss, "StandardGpuResources"):
+            index = faiss.index_cpu_to_gpu(self._faiss_gpu_resources(), 0, index)
+        index.add(points)
+        _, indices = index.search(points, k_neighbors)
+        return indices
+
+    def _faiss_gpu_resources(self):
+        res = getattr(self._faiss_local, 'res', None)
+        if res is None:
+            res = self._faiss_local.res = faiss.StandardGpuResources()
+        return res
+
     def build_complete_graph_edges(self, vertices, k_neighbors=8):
         """Build edges using k-nearest neighbors for complete graph connectivity"""
-        from sklearn.neighbors import NearestNeighbors
-        
         vertices_np = vertices.cpu().numpy() if isinstance(vertices, torch.Tensor) else vertices
         
         # Use k-nearest neighbors to build edges
-        nbrs = NearestNeighbors(n_neighbors=k_neighbors, algorithm='ball_tree').fit(vertices_np)
-        distances, indices = nbrs.kneighbors(vertices_np)
-        
-        # Create edge list
-        edges = []
-        for i in range(len(vertices_np)):
-            for j in indices[i]:
-                if i != j:  # Avoid self-loops
-                    edges.append([i, j])
-        
-        edges = torch.tensor(edges, dtype=torch.long).t().contiguous()
+        indices = self._knn_indices(vertices_np, k_neighbors)
+        
+        # Create edge list directly in [2, E] layout
+        if _pack_knn_edges is not None:
+            src, dst = _pack_knn_edges(np.ascontiguousarray(indices, dtype=np.int64))
+        else:
+            src = np.repeat(np.arange(len(vertices_np), dtype=np.int64), indices.shape[1])
+            dst = indices.reshape(-1).astype(np.int64, copy=False)
+            mask = (src != dst) & (dst >= 0)  # Avoid self-loops (and IVF's -1 padding)
+            src, dst = src[mask], dst[mask]
+        
+        # Sort by destination node so aggregation reads contiguous rows (CSR)
+        order = np.argsort(dst, kind='stable')
+        edges = torch.from_numpy(np.stack([src[order], dst[order]], axis=0))
         return edges
 
+    def face_edges(self, faces, num_nodes):
+        """Undirected mesh edges from faces, emitted in both directions [2, E].
+        Each shared edge appears once per adjacent face, so rows are sorted
+        (a, b) with a < b and collapsed through a 1-D key unique first."""
+        edges = faces[:, [0, 1, 1, 2, 2, 0]].reshape(-1, 2)
+        edges, _ = edges.sort(dim=1)
+        edges = edges.long()  # i * N + j overflows int32
+        keys = torch.unique(edges[:, 0] * num_nodes + edges[:, 1])
+        lo, hi = keys // num_nodes, keys % num_nodes
+        return torch.stack([torch.cat([lo, hi]), torch.cat([hi, lo])], dim=0)
+
+    def combine_edges(self, edges_from_faces, edges_from_knn, num_nodes):
+        """Merge face edges and kNN edges into one deduplicated [2, E] edge_index.
+        Each directed edge (i, j) is encoded as the single key j * N + i, so
+        deduplication is a 1-D unique instead of a row-wise unique(dim=...)
+        and the result comes back sorted by destination node"""
+        all_edges = torch.cat([edges_from_faces, edges_from_knn], dim=1)
+        keys = torch.unique(all_edges[1] * num_nodes + all_edges[0])
+        return torch.stack([keys % num_nodes, keys // num_nodes], dim=0)
+
+    def build_mesh_edges(self, vertices, faces=None, k_neighbors=8):
+        """Face + kNN edge_index for a mesh, served from the on-disk edge
+        cache when the same geometry was already processed"""
+        if faces is not None and len(faces) > 0:
+            # int32 halves the face array; it is widened to int64 only where
+            # edge keys are encoded
+            face_dtype = np.int32 if len(vertices) < 2**31 else np.int64
+            faces = torch.from_numpy(np.ascontiguousarray(faces, dtype=face_dtype))
+        else:
+            faces = None
+        
+        cache_path = self._edge_cache_path(vertices, faces, k_neighbors)
+        if cache_path and os.path.exists(cache_path):
+            try:
+                # Copy-on-write mapping: pages are read lazily, file stays untouched
+                return torch.from_numpy(np.load(cache_path, mmap_mode='c'))
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Ignoring unreadable edge cache {cache_path}: {e}")
+        
+        if faces is not None:
+            edges_from_faces = self.face_edges(faces, len(vertices))
+            avg_degree = edges_from_faces.shape[1] / len(vertices)
+            if avg_degree >= k_neighbors:
+                # Face 1-rings are already as dense as the kNN graph would be
+                edges_from_knn = torch.empty((2, 0), dtype=torch.long)
+            else:
+                # Add k-nearest neighbors for better connectivity
+                edges_from_knn = self.build_complete_graph_edges(vertices, k_neighbors)
+            
+            # Combine both edge sets
+            edge_index = self.combine_edges(edges_from_faces, edges_from_knn, len(vertices))
+        else:
+            # Fallback to k-nearest neighbors only
+            edge_index = self.build_complete_graph_edges(vertices, k_neighbors)
+        
+        if cache_path:
+            self._save_edge_cache(cache_path, edge_index)
+        return edge_index
+
+    def _edge_cache_path(self, vertices, faces, k_neighbors):
+        if not self.edge_cache_dir:
+            return None
+        h = hashlib.sha1(vertices.numpy().tobytes())
+        if faces is not None:
+            h.update(faces.numpy().tobytes())
+        # Approximate (FAISS IVF) and exact backends give different kNN edges
+        backend = self._knn_backend(len(vertices))
+        return os.path.join(self.edge_cache_dir,
+                            f"edges_v{EDGE_CACHE_VERSION}_{backend}_{h.hexdigest()[:16]}_{k_neighbors}.npy")
+
+    def _knn_backend(self, num_vertices):
+        """Name of the kNN implementation _knn_indices uses for this many vertices"""
+        if faiss is not None:
+            kind = "faissivf" if num_vertices > FAISS_IVF_MIN_VERTICES else "faissflat"
+            if self.device.type == "cuda" and hasattr(faiss, "StandardGpuResources"):
+                kind += "gpu"
+            return kind
+        if self.device.type == "cuda" and CuNearestNeighbors is not None:
+            return "cuml"
+        return "sklearnex" if SkNearestNeighbors is not None else "sklearn"
+
+    def _save_edge_cache(self, cache_path, edge_index):
+        tmp_path = None
+        try:
+            os.makedirs(self.edge_cache_dir, exist_ok=True)
+            # Unique temp name: prefetch workers may build the same geometry at once
+            with tempfile.NamedTemporaryFile(dir=self.edge_cache_dir, suffix=".tmp", delete=False) as f:
+                tmp_path = f.name
+                np.save(f, edge_index.numpy())
+            os.replace(tmp_path, cache_path)  # never expose a half-written file
+            self._prune_edge_cache()
+        except OSError as e:
+            print(f"⚠️ Could not write edge cache: {e}")
+            if tmp_path and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _prune_edge_cache(self):
+        """Drop the oldest cached edge files beyond EDGE_CACHE_MAX_FILES"""
+        entries = []
+        for entry in os.scandir(self.edge_cache_dir):
+            if entry.name.startswith("edges_") and entry.name.endswith(".npy"):
+                try:
+                    entries.append((entry.stat().st_mtime, entry.path))
+                except OSError:
+                    pass  # removed by another prefetch worker meanwhile
+        if len(entries) <= EDGE_CACHE_MAX_FILES:
+            return
+        entries.sort()
+        for _, path in entries[:-EDGE_CACHE_MAX_FILES]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass  # already removed by another worker
+
     def load_mesh_as_graph(self, file_path, k_neighbors=8):
         """Load mesh and convert to graph with enhanced connectivity"""
         try:
             mesh = trimesh.load(file_path, force='mesh')
-            vertices = torch.tensor(mesh.vertices, dtype=torch.float)
-            
-            # Build edges from faces if available
-            if hasattr(mesh, 'faces') and len(mesh.faces) > 0:
-                faces = torch.tensor(mesh.faces, dtype=torch.long)
-                edges_from_faces = torch.cat([
-                    faces[:, [0, 1]], faces[:, [1, 2]], faces[:, [2, 0]]
-                ], dim=0)
-                edges_from_faces = torch.unique(edges_from_faces, dim=0)
-                
-                # Add k-nearest neighbors for better connectivity
-                edges_from_knn = self.build_complete_graph_edges(vertices, k_neighbors)
-                
-                # Combine both edge sets
-                all_edges = torch.cat([edges_from_faces, edges_from_knn], dim=1)
-                all_edges = torch.unique(all_edges, dim=1)
-                
-                edge_index = all_edges
-            else:
-                # Fallback to k-nearest neighbors only
-                edge_index = self.build_complete_graph_edges(vertices, k_neighbors)
+            vertices = torch.from_numpy(np.ascontiguousarray(mesh.vertices, dtype=np.float32))
+            faces = mesh.faces if hasattr(mesh, 'faces') else None
+            edge_index = self.build_mesh_edges(vertices, faces, k_neighbors)
             
             print(f"📊 Mesh graph: {len(vertices)} vertices, {edge_index.shape[1]} edges")
-            return Data(x=vertices, edge_index=edge_index), mesh
+            return self._pin(Data(x=vertices, edge_index=edge_index)), mesh
             
         except Exception as e:
             print(f"❌ Error loading mesh: {e}")
             return None, None
 
-    def analyze_complete_mesh_stress(self, mesh_data, stress_threshold=0.7):
-        """Analyze stress across entire mesh without clustering"""
+    def prefetch(self, mesh_file_path, k_neighbors=8):
+        """Start loading a mesh graph in the background. The next
+        analyze_mesh call for the same path collects the result."""
+        future = self._prefetched.get(mesh_file_path)
+        if future is None:
+            future = self._prefetch_pool.submit(self.load_mesh_as_graph, mesh_file_path, k_neighbors)
+            self._prefetched[mesh_file_path] = future
+        return future
+
+    def _take_graph(self, mesh_file_path):
+        future = self._prefetched.pop(mesh_file_path, None)
+        if future is None:
+            return self.load_mesh_as_graph(mesh_file_path)
+        return future.result()
+
+    def _infer(self, mesh_data):
+        """Per-node stress predictions (FP32) and the matching vertex tensor.
+        Small meshes run one full-graph forward on self.device; huge meshes
+        fall back to mini-batches and return CPU tensors."""
+        if mesh_data.num_nodes > MINIBATCH_MIN_NODES:
+            try:
+                return self._predict_batched(mesh_data), mesh_data.x
+            except ImportError as e:
+                print(f"⚠️ Neighbor sampling unavailable, running full-graph forward: {e}")
+        
+        mesh_data = self._to_device(mesh_data)
+        with torch.inference_mode(), self._autocast():
+            preds = self._predict(mesh_data.x, mesh_data.edge_index)
+        # Back to FP32 so normalization keeps full precision
+        return preds.float(), mesh_data.x
+
+    def _predict_batched(self, mesh_data):
+        """Neighbor-sampled mini-batch inference with bounded device memory"""
+        from torch_geometric.loader import NeighborLoader
+        
+        data = Data(x=mesh_data.x, edge_index=mesh_data.edge_index)
+        if self.device.type == "cuda":
+            data.x = data.x.pin_memory()
+        loader = NeighborLoader(data, num_neighbors=MINIBATCH_NUM_NEIGHBORS, batch_size=MINIBATCH_SIZE)
+        
+        preds = torch.empty(data.num_nodes, dtype=torch.float32)
+        print(f"🧩 Mini-batch inference: {data.num_nodes} nodes in {len(loader)} batches")
+        with torch.inference_mode(), self._autocast():
+            for batch in loader:
+                # Short-lived sampled subgraphs run eagerly; compiling them buys nothing
+                out = self.inference_model(batch.x.to(self.device, non_blocking=True),
+                                           batch.edge_index.to(self.device, non_blocking=True))
+                preds[batch.n_id[:batch.batch_size]] = out[:batch.batch_size].float().cpu()
+        return preds
+
+    def analyze_complete_mesh_stress(self, mesh_data, stress_threshold=0.7, include_all=True):
+        """Analyze stress across entire mesh without clustering.
+        With include_all=False the per-node 'all_stress'/'all_vertices' arrays
+        (only needed for the distribution plot) are left out."""
         if self.model is None:
             raise ValueError("GNN model not loaded")
         
-        self.model.eval()
-        mesh_data = mesh_data.to(self.device)
-        
-        with torch.no_grad():
-            # Get stress predictions for ALL nodes
-            stress_predictions = self.model(mesh_data.x, mesh_data.edge_index)
-        
-        # Convert to numpy
-        stress_np = stress_predictions.cpu().numpy()
-        vertices_np = mesh_data.x.cpu().numpy()
+        # Get stress predictions for ALL nodes
+        stress_predictions, vertices = self._infer(mesh_data)
         
-        # Normalize stress scores to 0-1 range
-        stress_normalized = (stress_np - stress_np.min()) / (stress_np.max() - stress_np.min() + 1e-8)
+        # Normalize stress scores to 0-1 range on the device (one min/max reduction)
+        lo, hi = torch.aminmax(stress_predictions)
+        stress_normalized = (stress_predictions - lo) / (hi - lo + 1e-8)
         
-        # Identify high stress nodes
-        high_stress_mask = stress_normalized > stress_threshold
-        high_stress_indices = np.where(high_stress_mask)[0]
-        high_stress_points = vertices_np[high_stress_indices]
-        high_stress_scores = stress_normalized[high_stress_indices]
+        # Identify high stress nodes on the device; only the selected rows
+        # are transferred back
+        idx = (stress_normalized > stress_threshold).nonzero(as_tuple=False).squeeze(1)
+        high_stress_indices = idx.cpu().numpy()
+        high_stress_points = vertices.index_select(0, idx).cpu().numpy()
+        high_stress_scores = stress_normalized.index_select(0, idx).cpu().numpy()
         
         print(f"🔍 Stress analysis: {len(high_stress_indices)} high-stress nodes found "
               f"(threshold: {stress_threshold})")
         
-        return {
-            'all_stress': stress_normalized,
-            'all_vertices': vertices_np,
+        results = {
             'high_stress_points': high_stress_points,
             'high_stress_indices': high_stress_indices,
             'high_stress_scores': high_stress_scores,
-            'stress_range': (stress_np.min(), stress_np.max())
+            'stress_range': (lo.item(), hi.item())
         }
+        if include_all:
+            results['all_stress'] = stress_normalized.cpu().numpy()
+            # mesh_data still holds the host-side vertices, no transfer needed
+            results['all_vertices'] = mesh_data.x.numpy()
+        return results
 
     def get_top_stress_points(self, mesh_data, top_k=200):
         """Get top k highest stress points"""
         if self.model is None:
             raise ValueError("GNN model not loaded")
         
-        self.model.eval()
-        mesh_data = mesh_data.to(self.device)
-        
-        with torch.no_grad():
-            preds = self.model(mesh_data.x, mesh_data.edge_index)
-        
-        preds = preds.cpu().numpy()
-        vertices = mesh_data.x.cpu().numpy()
+        preds, vertices = self._infer(mesh_data)
+        return self._top_k(preds, vertices, top_k)
 
-        # Get top k points with highest stress scores
-        top_indices = np.argsort(-preds)[:top_k]  # Sort descending
-        top_points = vertices[top_indices]
-        top_scores = preds[top_indices]
+    @staticmethod
+    def _top_k(preds, vertices, top_k):
+        # Get top k points with highest stress scores (sorted descending);
+        # selection runs on the device so only k rows are transferred
+        top_scores, top_indices = torch.topk(preds, min(top_k, preds.numel()))
+        top_points = vertices.index_select(0, top_indices).cpu().numpy()
+        top_scores = top_scores.cpu().numpy()
+        top_indices = top_indices.cpu().numpy()
         
         return top_points, top_scores, top_indices
 
@@ -234,8 +716,8 @@ class GNNAnalyzer:
             return None, "GNN model not loaded"
         
         try:
-            # Load mesh as graph
-            mesh_data, mesh = self.load_mesh_as_graph(mesh_file_path)
+            # Load mesh as graph (or collect a prefetched one)
+            mesh_data, mesh = self._take_graph(mesh_file_path)
             if mesh_data is None:
                 return None, "Failed to load mesh"
             
@@ -255,34 +737,55 @@ class GNNAnalyzer:
         except Exception as e:
             return None, f"Analysis failed: {str(e)}"
 
+    def analyze_meshes(self, mesh_file_paths, top_k=200):
+        """Analyze several meshes with a single batched forward pass.
+        Returns one (results, status) pair per path, in input order."""
+        if self.model is None:
+            return [(None, "GNN model not loaded")] * len(mesh_file_paths)
+        
+        outcomes = [(None, "Failed to load mesh")] * len(mesh_file_paths)
+        # Load all meshes in parallel on the prefetch pool
+        for path in mesh_file_paths:
+            self.prefetch(path)
+        graphs = [self._take_graph(path)[0] for path in mesh_file_paths]
+        loaded = [i for i, g in enumerate(graphs) if g is not None]
+        if not loaded:
+            return outcomes
+        
+        try:
+            batch = Batch.from_data_list([graphs[i] for i in loaded]).to(self.device, non_blocking=True)
+            # The batched forward takes the per-mesh `batch` vector, which the
+            # compiled single-mesh path was not built for, so it runs eagerly
+            with torch.inference_mode(), self._autocast():
+                preds = self.inference_model(batch.x, batch.edge_index, batch.batch).float()
+            
+            sizes = (batch.ptr[1:] - batch.ptr[:-1]).tolist()
+            for i, mesh_preds, mesh_vertices in zip(loaded, preds.split(sizes), batch.x.split(sizes)):
+                top_points, top_scores, top_indices = self._top_k(mesh_preds, mesh_vertices, top_k)
+                outcomes[i] = ({
+                    'top_points': top_points,
+                    'top_scores': top_scores,
+                    'top_indices': top_indices
+                }, "Top points analysis success")
+            print(f"📦 Batched analysis: {len(loaded)} meshes, {batch.num_nodes} nodes in one forward")
+            return outcomes
+            
+        except Exception as e:
+            return [(None, f"Analysis failed: {str(e)}")] * len(mesh_file_paths)
+
     def analyze_vertices(self, vertices, faces=None, top_k=200, k_neighbors=8):
         """Analyze vertices directly without loading from file"""
         if self.model is None:
             return None, None, None, "GNN model not loaded"
         
         try:
-            # Convert vertices to tensor
-            vertices_tensor = torch.tensor(vertices, dtype=torch.float)
+            # Convert vertices to tensor (no copy when already float32 & contiguous)
+            vertices_tensor = torch.from_numpy(np.ascontiguousarray(vertices, dtype=np.float32))
             
             # Build enhanced edge connectivity
-            if faces is not None and len(faces) > 0:
-                faces_tensor = torch.tensor(faces, dtype=torch.long)
-                edges_from_faces = torch.cat([
-                    faces_tensor[:, [0, 1]], faces_tensor[:, [1, 2]], faces_tensor[:, [2, 0]]
-                ], dim=0)
-                edges_from_faces = torch.unique(edges_from_faces, dim=0)
-                
-                # Add k-nearest neighbors
-                edges_from_knn = self.build_complete_graph_edges(vertices_tensor, k_neighbors)
-                
-                # Combine edges
-                all_edges = torch.cat([edges_from_faces, edges_from_knn], dim=1)
-                edge_index = torch.unique(all_edges, dim=1)
-            else:
-                # Use k-nearest neighbors only
-                edge_index = self.build_complete_graph_edges(vertices_tensor, k_neighbors)
+            edge_index = self.build_mesh_edges(vertices_tensor, faces, k_neighbors)
             
-            mesh_data = Data(x=vertices_tensor, edge_index=edge_index)
+            mesh_data = self._pin(Data(x=vertices_tensor, edge_index=edge_index))
             
             # Get top stress points
             top_points, top_scores, top_indices = self.get_top_stress_points(mesh_data, top_k)
@@ -324,23 +827,32 @@ def create_gnn_analyzer(model_path="stability_gnn.pth"):
     return GNNAnalyzer(model_path)
 
 def save_stress_analysis(results, output_path="stress_analysis.json"):
-    """Save analysis results to JSON file"""
-    import json
-    
+    """Save analysis results: arrays go to a sidecar .npz next to a small
+    JSON metadata file that points at it"""
     try:
-        # Convert numpy arrays to lists for JSON serialization
+        # Arrays are written as raw NumPy buffers instead of Python lists
+        arrays_path = os.path.splitext(output_path)[0] + ".npz"
+        np.savez(arrays_path,
+                 high_stress_points=results['high_stress_points'],
+                 high_stress_indices=results['high_stress_indices'],
+                 high_stress_scores=results['high_stress_scores'])
+        
         save_data = {
-            'high_stress_points': results['high_stress_points'].tolist(),
-            'high_stress_indices': results['high_stress_indices'].tolist(),
-            'high_stress_scores': results['high_stress_scores'].tolist(),
-            'stress_range': results['stress_range'],
-            'total_high_stress_nodes': len(results['high_stress_indices'])
+            'stress_range': [float(v) for v in results['stress_range']],
+            'total_high_stress_nodes': int(len(results['high_stress_indices'])),
+            'arrays': os.path.basename(arrays_path)
         }
         
-        with open(output_path, 'w') as f:
-            json.dump(save_data, f, indent=2)
+        try:
+            import orjson
+            with open(output_path, 'wb') as f:
+                f.write(orjson.dumps(save_data, option=orjson.OPT_INDENT_2))
+        except ImportError:
+            import json
+            with open(output_path, 'w') as f:
+                json.dump(save_data, f, indent=2)
         
-        print(f"💾 Analysis results saved to: {output_path}")
+        print(f"💾 Analysis results saved to: {output_path} (+ {arrays_path})")
         
     except Exception as e:
         print(f"❌ Failed to save analysis: {e}")
@@ -2,19 +2,60 @@
 
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, 
-    QFrame, QScrollArea, QSizePolicy
+    QFrame, QScrollArea, QSizePolicy, QGraphicsScene, QGraphicsView,
+    QGraphicsItem, QGraphicsPixmapItem, QGraphicsEllipseItem
 )
-from PyQt6.QtGui import QFont, QPainter, QColor, QPen, QBrush, QMouseEvent, QCursor, QPixmap, QPainter, QPainterPath
-from PyQt6.QtCore import Qt, QPropertyAnimation, QEasingCurve, pyqtProperty, QSize, pyqtSignal, QEvent, QPointF, QRect, QTimer
+from PyQt6.QtGui import QFont, QPainter, QColor, QPen, QBrush, QMouseEvent, QCursor, QPixmap, QPainter, QPainterPath, QPolygonF, QRegion, QIcon
+from PyQt6.QtCore import Qt, QPropertyAnimation, QEasingCurve, pyqtProperty, QSize, pyqtSignal, QEvent, QPointF, QRect, QRectF, QTimer
 from PyQt6.QtWidgets import QApplication
 import math
+import numpy as np
 
+# Fixed angle offsets used by the drag dynamite's fuse (+0.3 rad) and sparks
+# (+pi/4 steps), applied with the angle-addition formulas
+FUSE_ANGLE_COS, FUSE_ANGLE_SIN = math.cos(0.3), math.sin(0.3)
+SPARK_STEP_COS, SPARK_STEP_SIN = math.cos(math.pi / 4), math.sin(math.pi / 4)
 
-class PersistentDynamiteWidget(QWidget):
-    """Persistent dynamite widget that stays in place after dropping"""
-    
-    def __init__(self, tool_type, range_radius, global_pos, parent=None):
-        super().__init__(parent)
+ICON_SIZE = 32
+_icon_pixmap = None
+
+
+def dynamite_icon_pixmap():
+    """The 🧨 tool icon, rasterized once (QPixmaps need a running QApplication)"""
+    global _icon_pixmap
+    if _icon_pixmap is None:
+        dpr = QApplication.primaryScreen().devicePixelRatio()
+        pixmap = QPixmap(int(ICON_SIZE * dpr), int(ICON_SIZE * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        
+        painter = QPainter(pixmap)
+        font = QFont("Arial")
+        font.setPixelSize(ICON_SIZE - 4)
+        painter.setFont(font)
+        painter.setPen(QColor("#FFD700"))
+        painter.drawText(QRect(0, 0, ICON_SIZE, ICON_SIZE), Qt.AlignmentFlag.AlignCenter, "🧨")
+        painter.end()
+        _icon_pixmap = pixmap
+    return _icon_pixmap
+
+
+class PersistentDynamiteItem(QGraphicsPixmapItem):
+    """Persistent dynamite that stays in place after dropping, drawn in the toolbar's overlay scene"""
+    
+    # animation_angle advances in 5° steps; pulse alpha per step, computed once
+    _PULSE_ALPHA = [40 + int(20 * math.sin(math.radians(a * 2))) for a in range(0, 360, 5)]
+    
+    # Paint resources are shared by every placed dynamite
+    _TEXT_PEN = QPen(QColor(255, 255, 255))
+    _BODY_BRUSH = QBrush(QColor(139, 0, 0))  # Dark red
+    _BODY_PEN = QPen(QColor(101, 67, 33), 2)  # Brown border
+    _END_BRUSH = QBrush(QColor(101, 67, 33))  # Brown
+    _FUSE_PEN = QPen(QColor(255, 215, 0), 2)  # Gold
+    _SPARK_PEN = QPen(QColor(255, 255, 0), 1)
+    
+    def __init__(self, tool_type, range_radius, global_pos, device_pixel_ratio=1.0):
+        super().__init__()
         self.tool_type = tool_type
         self.range_radius = range_radius
         self.animation_angle = 0
@@ -23,51 +64,53 @@ class PersistentDynamiteWidget(QWidget):
         # Set size based on range radius
         base_size = 80
         self.visual_radius = min(range_radius * 1.5, 150)  # Scale radius for visualization
-        widget_size = base_size + int(self.visual_radius * 2)
-        
-        self.setFixedSize(widget_size, widget_size)
-        
-        # Convert QPointF to integers for move() method
-        pos_x = int(global_pos.x() - widget_size // 2)
-        pos_y = int(global_pos.y() - widget_size // 2)
-        self.move(pos_x, pos_y)
-        
-        # Animation timer for subtle pulsing effect
-        self.animation_timer = QTimer(self)
-        self.animation_timer.timeout.connect(self.animate)
-        self.animation_timer.start(100)  # Slower pulse for placed dynamites
-        
-    def animate(self):
-        """Update animation for subtle pulsing effect"""
-        self.animation_angle = (self.animation_angle + 5) % 360
-        self.update()
-        
-    def paintEvent(self, event):
-        """Draw a persistent dynamite with subtle radius visualization"""
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
-        center_x = self.width() // 2
-        center_y = self.height() // 2
-        
-        # Draw subtle radius circle (less prominent than during drag)
-        pulse_alpha = 40 + int(20 * math.sin(math.radians(self.animation_angle * 2)))
-        radius_color = QColor(255, 215, 0, pulse_alpha)  # Subtle pulsating gold
-        
-        painter.setPen(QPen(radius_color, 1, Qt.PenStyle.DotLine))
-        painter.setBrush(Qt.BrushStyle.NoBrush)
-        painter.drawEllipse(center_x - self.visual_radius, center_y - self.visual_radius,
-                          self.visual_radius * 2, self.visual_radius * 2)
+        self.item_size = base_size + int(self.visual_radius * 2)
+        
+        # Top-left corner in overlay (parent widget) coordinates
+        self.setPos(int(global_pos.x() - self.item_size // 2),
+                    int(global_pos.y() - self.item_size // 2))
+        
+        # The stick and its label never change, so they are rasterized once
+        self._info_font = QFont("Arial", 8, QFont.Weight.Bold)
+        self.setPixmap(self.render_static_layer(device_pixel_ratio))
+        
+        # Subtle radius circle behind the stick; only its pen alpha changes
+        center = self.item_size // 2
+        self._radius_pen = QPen(QColor(255, 215, 0), 1, Qt.PenStyle.DotLine)
+        self.radius_ring = QGraphicsEllipseItem(center - self.visual_radius, center - self.visual_radius,
+                                                self.visual_radius * 2, self.visual_radius * 2, self)
+        self.radius_ring.setFlag(QGraphicsItem.GraphicsItemFlag.ItemStacksBehindParent)
+        self.radius_ring.setBrush(Qt.BrushStyle.NoBrush)
+        self.animate()
+        
+    def render_static_layer(self, dpr):
+        """Pre-render the static dynamite and label into a transparent pixmap"""
+        pixmap = QPixmap(int(self.item_size * dpr), int(self.item_size * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        
+        painter = QPainter(pixmap)
+        center_x = self.item_size // 2
+        center_y = self.item_size // 2
         
         # Draw static dynamite (no rotation for placed ones)
         self.draw_static_dynamite(painter, center_x, center_y)
         
         # Draw tool type and range text
-        painter.setPen(QPen(QColor(255, 255, 255)))
-        painter.setFont(QFont("Arial", 8, QFont.Weight.Bold))
+        painter.setPen(self._TEXT_PEN)
+        painter.setFont(self._info_font)
         info_text = f"{self.tool_type} (R:{self.range_radius})"
         text_rect = QRect(center_x - 40, center_y + 30, 80, 20)
         painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, info_text)
+        painter.end()
+        return pixmap
+        
+    def animate(self):
+        """Update animation for subtle pulsing effect (driven by COCToolbar's shared ticker)"""
+        self.animation_angle = (self.animation_angle + 5) % 360
+        pulse_alpha = self._PULSE_ALPHA[self.animation_angle // 5]
+        self._radius_pen.setColor(QColor(255, 215, 0, pulse_alpha))  # Subtle pulsating gold
+        self.radius_ring.setPen(self._radius_pen)
         
     def draw_static_dynamite(self, painter, center_x, center_y):
         """Draw a static dynamite stick (no rotation for placed ones)"""
@@ -79,38 +122,84 @@ class PersistentDynamiteWidget(QWidget):
         # Draw dynamite body (simple 2D representation)
         body_rect = QRect(center_x - length//2, center_y - width//2, length, width)
         
-        # Dynamite body (red)
-        painter.setBrush(QBrush(QColor(139, 0, 0)))  # Dark red
-        painter.setPen(QPen(QColor(101, 67, 33), 2))  # Brown border
+        # Dynamite body (red) - rounded corners are the only curves here
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+        painter.setBrush(self._BODY_BRUSH)
+        painter.setPen(self._BODY_PEN)
         painter.drawRoundedRect(body_rect, 4, 4)
         
-        # Brown ends
-        painter.setBrush(QBrush(QColor(101, 67, 33)))  # Brown
+        # Brown ends (axis-aligned, no antialiasing needed)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+        painter.setBrush(self._END_BRUSH)
         painter.drawRect(center_x - length//2, center_y - width//2, 4, width)  # Left end
         painter.drawRect(center_x + length//2 - 4, center_y - width//2, 4, width)  # Right end
         
-        # Static fuse
-        fuse_color = QColor(255, 215, 0)  # Gold
-        painter.setPen(QPen(fuse_color, 2))
+        # Static fuse (diagonal)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+        painter.setPen(self._FUSE_PEN)
         painter.drawLine(center_x + length//2, center_y, center_x + length//2 + 15, center_y - 10)
         
         # Small spark
-        painter.setPen(QPen(QColor(255, 255, 0), 1))
+        painter.setPen(self._SPARK_PEN)
         painter.drawLine(center_x + length//2 + 15, center_y - 10, center_x + length//2 + 18, center_y - 13)
         
+    def scene_center(self):
+        """Placement point in scene (parent widget) coordinates"""
+        return self.mapToScene(QPointF(self.item_size / 2, self.item_size / 2))
+        
     def get_dynamite_info(self):
         """Return dynamite information for simulation"""
+        center = self.scene_center()
+        view = self.scene().views()[0]
         return {
             'type': self.tool_type,
             'range': self.range_radius,
-            'position': self.pos(),
-            'global_position': self.mapToGlobal(self.rect().center())
+            'position': self.pos().toPoint(),
+            'global_position': view.mapToGlobal(view.mapFromScene(center))
         }
 
 
 class Dynamite3DDragWidget(QWidget):
     """3D Dynamite widget with radius visualization that appears during drag operations"""
     
+    # animation_angle advances in 10° steps, so every per-frame trig value is
+    # tabulated once: (rotation, cos, sin, scale, spark_phase, pulse_alpha)
+    _TRIG_TABLE = [
+        (math.radians(a), math.cos(math.radians(a)), math.sin(math.radians(a)),
+         0.8 + 0.2 * math.sin(math.radians(a * 2)),
+         math.sin(math.radians(a * 8)),
+         80 + int(40 * math.sin(math.radians(a * 4))))
+        for a in range(0, 360, 10)
+    ]
+    
+    # Unit box corners, scaled per frame by (length, width, height)
+    _UNIT_VERTS = np.array([
+        [-1, -1, -1],  # 0: back-left-bottom
+        [ 1, -1, -1],  # 1: front-left-bottom
+        [ 1,  1, -1],  # 2: front-right-bottom
+        [-1,  1, -1],  # 3: back-right-bottom
+        [-1, -1,  1],  # 4: back-left-top
+        [ 1, -1,  1],  # 5: front-left-top
+        [ 1,  1,  1],  # 6: front-right-top
+        [-1,  1,  1],  # 7: back-right-top
+    ], dtype=np.float32) / 2
+    
+    # Box faces (corner indices) with their fill, plus the shared paint resources.
+    # Corners are wound so the normal points outward; a face then faces the
+    # viewer exactly when its projected signed area is positive.
+    _FACES = [
+        ([0, 3, 2, 1], QBrush(QColor(139, 0, 0))),    # Bottom - Dark Red
+        ([4, 5, 6, 7], QBrush(QColor(160, 0, 0))),    # Top - Lighter Red
+        ([0, 1, 5, 4], QBrush(QColor(120, 0, 0))),    # Left - Darker Red
+        ([2, 3, 7, 6], QBrush(QColor(120, 0, 0))),    # Right - Darker Red
+        ([0, 4, 7, 3], QBrush(QColor(101, 67, 33))),  # Back - Brown
+        ([1, 2, 6, 5], QBrush(QColor(101, 67, 33))),  # Front - Brown
+    ]
+    _EDGE_PEN = QPen(QColor(50, 50, 50), 1)
+    _RANGE_TEXT_PEN = QPen(QColor(255, 255, 255, 180))
+    _TEXT_PEN = QPen(QColor(255, 255, 255))
+    _FUSE_PEN = QPen(QColor(255, 215, 0), 3)  # Gold
+    
     def __init__(self, tool_type, range_radius, parent=None):
         super().__init__(parent)
         self.tool_type = tool_type
@@ -128,16 +217,60 @@ class Dynamite3DDragWidget(QWidget):
                            Qt.WindowType.Tool)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
         
+        # Only the ring, its label and the dynamite itself are ever painted
+        self.setMask(self.build_paint_mask())
+        
+        # Projected box corners and one quad per face, refilled in place every frame
+        self._points_2d = [QPointF() for _ in range(8)]
+        self._face_polys = [QPolygonF([QPointF()] * 4) for _ in range(6)]
+        self._fuse_start = QPointF()
+        self._fuse_end = QPointF()
+        self._spark_end = QPointF()
+        
+        # Animated pens only get their alpha updated per frame
+        self._radius_pen = QPen(QColor(255, 215, 0), 2, Qt.PenStyle.DashLine)
+        self._spark_pen = QPen(QColor(255, 255, 0), 2)
+        self._range_font = QFont("Arial", 9, QFont.Weight.Bold)
+        self._info_font = QFont("Arial", 8, QFont.Weight.Bold)
+        
+        # Latest cursor position, applied once per animation tick
+        self._pending_global_pos = None
+        
         # Animation timer for 3D rotation effect
         self.animation_timer = QTimer(self)
         self.animation_timer.timeout.connect(self.animate)
         self.animation_timer.start(50)  # 20 FPS
         
+    def build_paint_mask(self):
+        """Region covering the range ring, range text and dynamite, leaving the disc interior out"""
+        center_x = self.width() // 2
+        center_y = self.height() // 2
+        r = int(self.visual_radius)
+        ring_width = 3  # Dashed pen is 2 px wide, plus a pixel for antialiasing
+        
+        outer = QRegion(QRect(center_x - r - ring_width, center_y - r - ring_width,
+                              2 * (r + ring_width), 2 * (r + ring_width)), QRegion.RegionType.Ellipse)
+        inner = QRegion(QRect(center_x - r + ring_width, center_y - r + ring_width,
+                              2 * (r - ring_width), 2 * (r - ring_width)), QRegion.RegionType.Ellipse)
+        
+        # Rotating stick, fuse sparks and tool type text stay within this box
+        dynamite = QRegion(QRect(center_x - 64, center_y - 64, 128, 128))
+        range_text = QRegion(QRect(center_x - 40, center_y - r - 25, 80, 20))
+        return outer.subtracted(inner).united(dynamite).united(range_text)
+        
     def animate(self):
-        """Update animation for 3D rotation effect"""
+        """Update animation for 3D rotation effect and follow the cursor"""
         self.animation_angle = (self.animation_angle + 10) % 360
+        if self._pending_global_pos is not None:
+            pos = self._pending_global_pos
+            self._pending_global_pos = None
+            self.move(int(pos.x() - self.width() // 2), int(pos.y() - self.height() // 2))
         self.update()
         
+    def set_pending_position(self, global_pos):
+        """Queue a move to global_pos; coalesced into the next animation tick"""
+        self._pending_global_pos = global_pos
+        
     def paintEvent(self, event):
         """Draw a 3D dynamite stick with animated radius visualization"""
         painter = QPainter(self)
@@ -147,17 +280,17 @@ class Dynamite3DDragWidget(QWidget):
         center_y = self.height() // 2
         
         # Draw pulsating radius circle
-        pulse_alpha = 80 + int(40 * math.sin(math.radians(self.animation_angle * 4)))
-        radius_color = QColor(255, 215, 0, pulse_alpha)  # Pulsating gold
+        pulse_alpha = self._TRIG_TABLE[self.animation_angle // 10][5]
+        self._radius_pen.setColor(QColor(255, 215, 0, pulse_alpha))  # Pulsating gold
         
-        painter.setPen(QPen(radius_color, 2, Qt.PenStyle.DashLine))
+        painter.setPen(self._radius_pen)
         painter.setBrush(Qt.BrushStyle.NoBrush)
         painter.drawEllipse(center_x - self.visual_radius, center_y - self.visual_radius,
                           self.visual_radius * 2, self.visual_radius * 2)
         
         # Draw range text
-        painter.setPen(QPen(QColor(255, 255, 255, 180)))
-        painter.setFont(QFont("Arial", 9, QFont.Weight.Bold))
+        painter.setPen(self._RANGE_TEXT_PEN)
+        painter.setFont(self._range_font)
         range_text = f"Range: {self.range_radius}"
         text_rect = QRect(center_x - 40, center_y - self.visual_radius - 25, 80, 20)
         painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, range_text)
@@ -167,111 +300,90 @@ class Dynamite3DDragWidget(QWidget):
         
     def draw_3d_dynamite(self, painter, center_x, center_y):
         """Draw a 3D perspective dynamite stick"""
-        # Calculate 3D rotation
-        rotation = math.radians(self.animation_angle)
-        scale = 0.8 + 0.2 * math.sin(math.radians(self.animation_angle * 2))  # Bouncing effect
-        
-        # Dynamite dimensions
-        length = 60 * scale
-        width = 20 * scale
-        height = 20 * scale
-        
-        # 3D transformation points
-        points_3d = [
-            (-length/2, -width/2, -height/2),  # 0: back-left-bottom
-            ( length/2, -width/2, -height/2),  # 1: front-left-bottom
-            ( length/2,  width/2, -height/2),  # 2: front-right-bottom
-            (-length/2,  width/2, -height/2),  # 3: back-right-bottom
-            (-length/2, -width/2,  height/2),  # 4: back-left-top
-            ( length/2, -width/2,  height/2),  # 5: front-left-top
-            ( length/2,  width/2,  height/2),  # 6: front-right-top
-            (-length/2,  width/2,  height/2),  # 7: back-right-top
-        ]
-        
-        # Apply 3D rotation and project to 2D
-        points_2d = []
-        for x, y, z in points_3d:
-            # Rotate around Y axis
-            x_rot = x * math.cos(rotation) + z * math.sin(rotation)
-            y_rot = y
-            z_rot = -x * math.sin(rotation) + z * math.cos(rotation)
-            
-            # Simple perspective projection
-            perspective = 1 + z_rot * 0.001
-            x_proj = center_x + x_rot * perspective
-            y_proj = center_y + y_rot * perspective
-            
-            points_2d.append((x_proj, y_proj))
+        # Calculate 3D rotation (scale gives the bouncing effect)
+        _, cos_r, sin_r, scale, spark_phase, _ = self._TRIG_TABLE[self.animation_angle // 10]
+        
+        # Dynamite dimensions (length, width, height)
+        verts = self._UNIT_VERTS * np.array([60 * scale, 20 * scale, 20 * scale], dtype=np.float32)
+        
+        # Rotate all corners around the Y axis at once
+        rotation_matrix = np.array([[cos_r, 0, sin_r],
+                                    [0,     1, 0    ],
+                                    [-sin_r, 0, cos_r]], dtype=np.float32)
+        rotated = verts @ rotation_matrix.T
+        
+        # Simple perspective projection to 2D
+        perspective = 1 + rotated[:, 2] * 0.001
+        xs = center_x + rotated[:, 0] * perspective
+        ys = center_y + rotated[:, 1] * perspective
+        for point, x, y in zip(self._points_2d, xs.tolist(), ys.tolist()):
+            point.setX(x)
+            point.setY(y)
         
         # Draw 3D dynamite faces
-        self.draw_3d_cube(painter, points_2d)
+        self.draw_3d_cube(painter, self._points_2d)
         
         # Draw fuse with animation
-        self.draw_animated_fuse(painter, center_x, center_y, rotation, scale)
+        self.draw_animated_fuse(painter, center_x, center_y, cos_r, sin_r, scale, spark_phase)
         
         # Draw tool type text
-        painter.setPen(QPen(QColor(255, 255, 255)))
-        painter.setFont(QFont("Arial", 8, QFont.Weight.Bold))
+        painter.setPen(self._TEXT_PEN)
+        painter.setFont(self._info_font)
         text_rect = QRect(center_x - 30, center_y + 40, 60, 20)
         painter.drawText(text_rect, Qt.AlignmentFlag.AlignCenter, self.tool_type)
         
     def draw_3d_cube(self, painter, points):
         """Draw the 3D cube representing the dynamite stick"""
-        # Define faces (vertices indices)
-        faces = [
-            ([0, 1, 2, 3], QColor(139, 0, 0)),    # Bottom - Dark Red
-            ([4, 5, 6, 7], QColor(160, 0, 0)),    # Top - Lighter Red
-            ([0, 1, 5, 4], QColor(120, 0, 0)),    # Left - Darker Red
-            ([2, 3, 7, 6], QColor(120, 0, 0)),    # Right - Darker Red
-            ([0, 3, 7, 4], QColor(101, 67, 33)),  # Back - Brown
-            ([1, 2, 6, 5], QColor(101, 67, 33)),  # Front - Brown
-        ]
-        
-        # Draw each face
-        for vertex_indices, color in faces:
-            path = QPainterPath()
-            first_point = points[vertex_indices[0]]
-            path.moveTo(first_point[0], first_point[1])
+        painter.setPen(self._EDGE_PEN)
+        
+        # Draw each front face (projected box faces are always convex quads)
+        for poly, (vertex_indices, brush) in zip(self._face_polys, self._FACES):
+            p0, p1, p2 = points[vertex_indices[0]], points[vertex_indices[1]], points[vertex_indices[2]]
+            area = (p1.x() - p0.x()) * (p2.y() - p1.y()) - (p2.x() - p1.x()) * (p1.y() - p0.y())
+            if area <= 0:
+                continue  # Back-facing or edge-on, hidden behind the front faces
             
-            for i in vertex_indices[1:]:
-                path.lineTo(points[i][0], points[i][1])
-            path.closeSubpath()
+            for corner, i in enumerate(vertex_indices):
+                poly[corner] = points[i]
             
-            painter.setBrush(QBrush(color))
-            painter.setPen(QPen(QColor(50, 50, 50), 1))
-            painter.drawPath(path)
+            painter.setBrush(brush)
+            painter.drawConvexPolygon(poly)
     
-    def draw_animated_fuse(self, painter, center_x, center_y, rotation, scale):
+    def draw_animated_fuse(self, painter, center_x, center_y, cos_r, sin_r, scale, spark_phase):
         """Draw animated fuse with sparks"""
         # Fuse position (attached to front of dynamite)
         fuse_length = 25 * scale
-        fuse_start_x = center_x + 30 * math.cos(rotation) * scale
-        fuse_start_y = center_y - 30 * math.sin(rotation) * scale
+        fuse_start_x = center_x + 30 * cos_r * scale
+        fuse_start_y = center_y - 30 * sin_r * scale
         
-        # Animated fuse end with sparks
-        spark_phase = math.sin(math.radians(self.animation_angle * 8))
-        fuse_end_x = fuse_start_x + fuse_length * math.cos(rotation + 0.3)
-        fuse_end_y = fuse_start_y - fuse_length * math.sin(rotation + 0.3)
+        # Animated fuse end with sparks, angled at rotation + 0.3
+        cos_f = cos_r * FUSE_ANGLE_COS - sin_r * FUSE_ANGLE_SIN
+        sin_f = sin_r * FUSE_ANGLE_COS + cos_r * FUSE_ANGLE_SIN
+        fuse_end_x = fuse_start_x + fuse_length * cos_f
+        fuse_end_y = fuse_start_y - fuse_length * sin_f
         
         # Draw fuse
-        fuse_color = QColor(255, 215, 0)  # Gold
-        painter.setPen(QPen(fuse_color, 3))
-        painter.drawLine(int(fuse_start_x), int(fuse_start_y), 
-                        int(fuse_end_x), int(fuse_end_y))
+        self._fuse_start.setX(fuse_start_x)
+        self._fuse_start.setY(fuse_start_y)
+        self._fuse_end.setX(fuse_end_x)
+        self._fuse_end.setY(fuse_end_y)
+        painter.setPen(self._FUSE_PEN)
+        painter.drawLine(self._fuse_start, self._fuse_end)
         
         # Draw sparks
         if spark_phase > 0:
             spark_size = 3 + int(2 * spark_phase)
-            spark_color = QColor(255, 255, 0, int(200 * spark_phase))
-            painter.setPen(QPen(spark_color, 2))
+            self._spark_pen.setColor(QColor(255, 255, 0, int(200 * spark_phase)))
+            painter.setPen(self._spark_pen)
             
-            # Multiple spark lines
+            # Multiple spark lines at rotation + i * pi/4
+            cos_a, sin_a = cos_r, sin_r
             for i in range(3):
-                angle = rotation + (i * math.pi / 4)
-                spark_end_x = fuse_end_x + spark_size * math.cos(angle)
-                spark_end_y = fuse_end_y - spark_size * math.sin(angle)
-                painter.drawLine(int(fuse_end_x), int(fuse_end_y),
-                               int(spark_end_x), int(spark_end_y))
+                self._spark_end.setX(fuse_end_x + spark_size * cos_a)
+                self._spark_end.setY(fuse_end_y - spark_size * sin_a)
+                painter.drawLine(self._fuse_end, self._spark_end)
+                cos_a, sin_a = (cos_a * SPARK_STEP_COS - sin_a * SPARK_STEP_SIN,
+                                sin_a * SPARK_STEP_COS + cos_a * SPARK_STEP_SIN)
     
     def closeEvent(self, event):
         """Clean up animation timer"""
@@ -279,6 +391,10 @@ class Dynamite3DDragWidget(QWidget):
         super().closeEvent(event)
 
 
+class RangeIndicatorBar(QLabel):
+    """Gradient range bar under each tool; styled through DraggableDynamiteTool.STYLE_SHEET"""
+
+
 class DraggableDynamiteTool(QWidget):
     """Draggable dynamite tool with drag & drop functionality"""
     
@@ -286,6 +402,29 @@ class DraggableDynamiteTool(QWidget):
     dragStarted = pyqtSignal(object)  # Emits the tool instance
     dragFinished = pyqtSignal(object, QPointF)  # Emits tool and global position
     
+    # Applied once on the tools container and inherited by every tool, so the
+    # gradients are parsed a single time instead of per instance
+    STYLE_SHEET = """
+        DraggableDynamiteTool {
+            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                stop:0 #8B4513, stop:0.4 #A0522D, stop:0.6 #8B4513,
+                stop:1 #654321);
+            border: 2px solid #5D4037;
+            border-radius: 10px;
+        }
+        DraggableDynamiteTool:hover {
+            background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
+                stop:0 #9C661F, stop:0.4 #B8860B, stop:0.6 #9C661F,
+                stop:1 #765432);
+            border: 2px solid #FFD700;
+        }
+        RangeIndicatorBar {
+            background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                stop:0 #00FF00, stop:0.5 #FFFF00, stop:1 #FF0000);
+            border-radius: 2px;
+        }
+    """
+    
     def __init__(self, tool_type, range_radius, sensor_value, parent=None):
         super().__init__(parent)
         self.tool_type = tool_type
@@ -296,30 +435,15 @@ class DraggableDynamiteTool(QWidget):
         self.drag_widget = None
         
         self.setFixedSize(70, 70)  # Slightly larger for better visual
-        self.setStyleSheet("""
-            DraggableDynamiteTool {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #8B4513, stop:0.4 #A0522D, stop:0.6 #8B4513,
-                    stop:1 #654321);
-                border: 2px solid #5D4037;
-                border-radius: 10px;
-            }
-            DraggableDynamiteTool:hover {
-                background: qlineargradient(x1:0, y1:0, x2:0, y2:1,
-                    stop:0 #9C661F, stop:0.4 #B8860B, stop:0.6 #9C661F,
-                    stop:1 #765432);
-                border: 2px solid #FFD700;
-            }
-        """)
         
         layout = QVBoxLayout(self)
         layout.setContentsMargins(5, 5, 5, 5)
         layout.setSpacing(3)
         
         # Tool icon - using 3D-like representation
-        icon_label = QLabel("🧨")  # Firecracker emoji as icon
+        icon_label = QLabel()
+        icon_label.setPixmap(dynamite_icon_pixmap())  # Firecracker emoji, pre-rasterized
         icon_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        icon_label.setFont(QFont("Arial", 22, QFont.Weight.Bold))
         icon_label.setStyleSheet("color: #FFD700; background: transparent;")
         layout.addWidget(icon_label)
         
@@ -338,17 +462,10 @@ class DraggableDynamiteTool(QWidget):
         range_layout.addWidget(range_label)
         
         # Visual range indicator bar
-        range_bar = QLabel()
+        range_bar = RangeIndicatorBar()
         range_bar.setFixedHeight(4)
         bar_width = min(range_radius * 2, 40)  # Scale bar width with range
         range_bar.setFixedWidth(bar_width)
-        range_bar.setStyleSheet(f"""
-            QLabel {{
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 #00FF00, stop:0.5 #FFFF00, stop:1 #FF0000);
-                border-radius: 2px;
-            }}
-        """)
         range_layout.addWidget(range_bar)
         range_layout.addStretch()
         
@@ -395,13 +512,21 @@ class DraggableDynamiteTool(QWidget):
         
         self.drag_start_pos = None
 
+    def cancel_drag(self):
+        """Abort an active drag without placing a dynamite"""
+        if self.is_dragging:
+            self.is_dragging = False
+            QApplication.restoreOverrideCursor()
+        if self.drag_widget:
+            self.drag_widget.close()  # Stops its animation timer
+            self.drag_widget.deleteLater()
+            self.drag_widget = None
+        self.drag_start_pos = None
+
     def updateDragPosition(self, global_pos):
-        """Update drag widget position during drag"""
+        """Update drag widget position during drag (applied at the widget's frame rate)"""
         if self.is_dragging and self.drag_widget:
-            # Convert QPointF to integers for move() method
-            pos_x = int(global_pos.x() - self.drag_widget.width() // 2)
-            pos_y = int(global_pos.y() - self.drag_widget.height() // 2)
-            self.drag_widget.move(pos_x, pos_y)
+            self.drag_widget.set_pending_position(global_pos)
 
 
 class COCToolbar(QWidget):
@@ -411,6 +536,17 @@ class COCToolbar(QWidget):
     toolDropped = pyqtSignal(object, QPointF)  # tool, global_position
     dynamitePlaced = pyqtSignal(object, QPointF)  # tool, global_position for persistent placement
     
+    _DEMO_TOOLS_DATA = [
+        ("TNT", 50, 80),      # Large range
+        ("Dyna-S", 30, 60),   # Medium range
+        ("Mega-B", 70, 95),   # Very large range
+        ("Micro-D", 20, 40),  # Small range
+        ("Nano-X", 15, 30),   # Very small range
+        ("Thermo", 60, 85),   # Large range
+        ("Geo-B", 45, 70),    # Medium-large range
+        ("Hydro", 35, 65)     # Medium range
+    ]
+    
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setParent(parent)
@@ -421,6 +557,29 @@ class COCToolbar(QWidget):
         self.current_dragged_tool = None
         self.placed_dynamites = []  # Track all placed dynamites
         
+        self._glow_pen = QPen(QColor(255, 215, 0, 60))
+        self._glow_pen.setWidth(3)
+        self._glow_cache = None  # Glow outline for the current size, built on demand
+        
+        # One ticker drives the pulse of every placed dynamite, instead of a
+        # timer per widget
+        self._tick_timer = QTimer(self)
+        self._tick_timer.setInterval(100)  # Slower pulse for placed dynamites
+        self._tick_timer.timeout.connect(self._on_tick)
+        
+        # Placed dynamites are items in one transparent scene overlaid on the
+        # parent, rather than a backing-store widget each
+        self._overlay_scene = QGraphicsScene(self)
+        self._overlay_view = QGraphicsView(self._overlay_scene, self.parent())
+        self._overlay_view.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents, True)
+        self._overlay_view.setStyleSheet("background: transparent; border: none;")
+        self._overlay_view.setFrameShape(QFrame.Shape.NoFrame)
+        self._overlay_view.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self._overlay_view.setVerticalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self._overlay_view.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop)
+        self._overlay_view.setRenderHint(QPainter.RenderHint.Antialiasing)
+        self._overlay_view.hide()
+        
         # Setup UI
         self.setup_ui()
         
@@ -440,7 +599,9 @@ class COCToolbar(QWidget):
         self.main_layout.setSpacing(0)
         
         # Toggle button (always visible)
-        self.toggle_btn = QPushButton("🧨")  # Changed to firecracker emoji
+        self.toggle_btn = QPushButton()
+        self.toggle_btn.setIcon(QIcon(dynamite_icon_pixmap()))  # Firecracker emoji
+        self.toggle_btn.setIconSize(QSize(24, 24))
         self.toggle_btn.setFixedSize(40, 60)
         self.toggle_btn.setStyleSheet("""
             QPushButton {
@@ -481,7 +642,7 @@ class COCToolbar(QWidget):
                 border-left: none;
                 border-radius: 0px 8px 8px 0px;
             }
-        """)
+        """ + DraggableDynamiteTool.STYLE_SHEET)
         self.tools_container.setFixedHeight(74)  # Increased height for larger tools
         
         # Tools layout
@@ -490,51 +651,52 @@ class COCToolbar(QWidget):
         self.tools_layout.setSpacing(8)
         self.tools_layout.setAlignment(Qt.AlignmentFlag.AlignLeft)
         
-        # Create demo tools
-        self.create_demo_tools()
+        # Demo tools are built on first expand, the toolbar starts collapsed
+        self.tools = []
+        self._tools_built = False
         
         self.main_layout.addWidget(self.tools_container)
         
-        # Install event filter for global mouse tracking
-        QApplication.instance().installEventFilter(self)
+        # Watch the top-level window for minimize/restore; global mouse
+        # tracking is only installed while a drag is in progress
+        self.window().installEventFilter(self)
         
     def create_demo_tools(self):
         """Create demo dynamite tools with different ranges"""
-        tools_data = [
-            ("TNT", 50, 80),      # Large range
-            ("Dyna-S", 30, 60),   # Medium range
-            ("Mega-B", 70, 95),   # Very large range
-            ("Micro-D", 20, 40),  # Small range
-            ("Nano-X", 15, 30),   # Very small range
-            ("Thermo", 60, 85),   # Large range
-            ("Geo-B", 45, 70),    # Medium-large range
-            ("Hydro", 35, 65)     # Medium range
-        ]
-        
-        self.tools = []
-        for tool_type, range_radius, sensor_value in tools_data:
+        self._tools_built = True
+        for tool_type, range_radius, sensor_value in self._DEMO_TOOLS_DATA:
             tool = DraggableDynamiteTool(tool_type, range_radius, sensor_value)
             tool.dragStarted.connect(self.on_tool_drag_started)
             tool.dragFinished.connect(self.on_tool_drag_finished)
             self.tools_layout.addWidget(tool)
             self.tools.append(tool)
     
+    def _ensure_tools(self):
+        """Build the demo tools the first time they are needed"""
+        if not self._tools_built:
+            self.create_demo_tools()
+    
     def on_tool_drag_started(self, tool):
         """Handle tool drag start"""
         self.current_dragged_tool = tool
+        QApplication.instance().installEventFilter(self)
         print(f"Started dragging: {tool.tool_type} (Range: {tool.range_radius})")
     
     def on_tool_drag_finished(self, tool, global_position):
         """Handle tool drag finish - create persistent dynamite"""
+        QApplication.instance().removeEventFilter(self)
         if self.current_dragged_tool == tool:
             self.current_dragged_tool = None
             
             # Create persistent dynamite that stays in place
-            persistent_dynamite = PersistentDynamiteWidget(
-                tool.tool_type, tool.range_radius, global_position, self.parent()
+            self._sync_overlay()
+            persistent_dynamite = PersistentDynamiteItem(
+                tool.tool_type, tool.range_radius, global_position,
+                self._overlay_view.devicePixelRatioF()
             )
-            persistent_dynamite.show()
+            self._overlay_scene.addItem(persistent_dynamite)
             self.placed_dynamites.append(persistent_dynamite)
+            self._update_ticker()
             
             # Emit both signals for compatibility
             self.toolDropped.emit(tool, global_position)
@@ -545,23 +707,70 @@ class COCToolbar(QWidget):
     
     def clear_all_dynamites(self):
         """Remove all placed dynamites"""
-        for dynamite in self.placed_dynamites:
-            dynamite.close()
-            dynamite.deleteLater()
+        self._overlay_scene.clear()
         self.placed_dynamites.clear()
+        self._overlay_view.hide()
+        self._update_ticker()
         print("Cleared all placed dynamites")
     
     def get_placed_dynamites(self):
         """Get information about all placed dynamites"""
         return [dynamite.get_dynamite_info() for dynamite in self.placed_dynamites]
     
+    def get_dynamites_near(self, position, radius):
+        """Placed dynamites whose centre lies within radius of position (parent coordinates)"""
+        # The overlay scene's BSP index narrows the search to nearby items
+        search_rect = QRectF(position.x() - radius, position.y() - radius, 2 * radius, 2 * radius)
+        nearby = []
+        for item in self._overlay_scene.items(search_rect):
+            if isinstance(item, PersistentDynamiteItem):
+                offset = item.scene_center() - QPointF(position)
+                if offset.x() ** 2 + offset.y() ** 2 <= radius ** 2:
+                    nearby.append(item)
+        return nearby
+    
+    def _sync_overlay(self):
+        """Stretch the overlay over the parent so scene and parent coordinates match"""
+        host = self._overlay_view.parentWidget()
+        if host is not None:
+            self._overlay_view.setGeometry(host.rect())
+            self._overlay_scene.setSceneRect(QRectF(host.rect()))
+        self._overlay_view.show()
+        self._overlay_view.raise_()
+    
+    def _on_tick(self):
+        """Advance the pulse animation of all placed dynamites"""
+        for dynamite in self.placed_dynamites:
+            if dynamite.isVisible():
+                dynamite.animate()
+    
+    def _update_ticker(self):
+        """Run the pulse ticker only while placed dynamites can actually be seen"""
+        should_run = (bool(self.placed_dynamites) and self.is_expanded and
+                      self.isVisible() and not self.window().isMinimized())
+        if should_run and not self._tick_timer.isActive():
+            self._tick_timer.start()
+        elif not should_run and self._tick_timer.isActive():
+            self._tick_timer.stop()
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.window().installEventFilter(self)  # No-op if already installed
+        self._update_ticker()
+    
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._update_ticker()
+    
     def eventFilter(self, obj, event):
-        """Global event filter to track mouse movement during drag"""
-        if (event.type() == QEvent.Type.MouseMove and 
-            self.current_dragged_tool and 
-            self.current_dragged_tool.is_dragging):
-            
-            self.current_dragged_tool.updateDragPosition(event.globalPosition().toPoint())
+        """Track mouse movement during drag and minimize/restore of the window"""
+        tool = self.current_dragged_tool
+        if tool is not None and event.type() == QEvent.Type.MouseMove:
+            if tool.is_dragging:
+                tool.updateDragPosition(event.globalPosition().toPoint())
+        elif event.type() == QEvent.Type.WindowStateChange and obj is self.window():
+            # Pause the pulse animation while the window is minimized
+            self._update_ticker()
         
         return super().eventFilter(obj, event)
     
@@ -578,6 +787,7 @@ class COCToolbar(QWidget):
             return
             
         self.is_expanded = True
+        self._ensure_tools()
         
         # Calculate expanded width (tools width + padding)
         expanded_width = 450  # Slightly wider for larger tools
@@ -591,7 +801,9 @@ class COCToolbar(QWidget):
         self.animation.start()
         
         # Update toggle button indicator
+        self.toggle_btn.setIcon(QIcon())
         self.toggle_btn.setText("◀")
+        self._update_ticker()
     
     def collapse(self):
         """Collapse the toolbar"""
@@ -612,10 +824,13 @@ class COCToolbar(QWidget):
         self.animation.start()
         
         # Update toggle button indicator
-        self.toggle_btn.setText("🧨")  # Changed to firecracker emoji
+        self.toggle_btn.setText("")
+        self.toggle_btn.setIcon(QIcon(dynamite_icon_pixmap()))  # Firecracker emoji
+        self._update_ticker()
     
     def add_tool(self, tool_type, range_radius, sensor_value):
         """Add a new tool to the toolbar"""
+        self._ensure_tools()
         tool = DraggableDynamiteTool(tool_type, range_radius, sensor_value)
         tool.dragStarted.connect(self.on_tool_drag_started)
         tool.dragFinished.connect(self.on_tool_drag_finished)
@@ -628,36 +843,73 @@ class COCToolbar(QWidget):
     
     def remove_tool(self, tool_type):
         """Remove a tool from the toolbar by type"""
+        self._ensure_tools()
         for tool in self.tools:
             if tool.tool_type == tool_type:
-                tool.dragStarted.disconnect()
-                tool.dragFinished.disconnect()
-                self.tools_layout.removeWidget(tool)
-                tool.deleteLater()
+                self._discard_tool(tool)
                 self.tools.remove(tool)
                 break
     
+    def _discard_tool(self, tool):
+        """Detach a tool from the toolbar, cancelling its drag if one is in progress"""
+        if self.current_dragged_tool is tool:
+            self.current_dragged_tool = None
+            QApplication.instance().removeEventFilter(self)
+        tool.cancel_drag()
+        
+        for signal, slot in ((tool.dragStarted, self.on_tool_drag_started),
+                             (tool.dragFinished, self.on_tool_drag_finished)):
+            try:
+                signal.disconnect(slot)
+            except TypeError:
+                pass  # Was never connected
+        
+        self.tools_layout.removeWidget(tool)
+        tool.deleteLater()
+    
     def get_tools(self):
         """Get list of available tools"""
+        self._ensure_tools()
         return self.tools
     
     def clear_tools(self):
         """Remove all tools from toolbar"""
-        for tool in self.tools[:]:
-            self.remove_tool(tool.tool_type)
+        self._ensure_tools()
+        
+        # Hold repaints until the whole row is gone, instead of relaying out per tool
+        self.tools_container.setUpdatesEnabled(False)
+        for tool in self.tools:
+            self._discard_tool(tool)
+        self.tools.clear()
+        self.tools_container.setUpdatesEnabled(True)
     
     def paintEvent(self, event):
         """Custom paint event for additional styling"""
-        painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-        
         # Draw subtle glow effect when expanded
         if self.is_expanded:
-            pen = QPen(QColor(255, 215, 0, 60))
-            pen.setWidth(3)
-            painter.setPen(pen)
-            painter.setBrush(Qt.BrushStyle.NoBrush)
-            painter.drawRoundedRect(self.rect().adjusted(1, 1, -1, -1), 8, 8)
+            if self._glow_cache is None:
+                self._glow_cache = self.render_glow()
+            painter = QPainter(self)
+            painter.drawPixmap(0, 0, self._glow_cache)
+    
+    def render_glow(self):
+        """Stroke the glow outline once into a transparent pixmap of the current size"""
+        dpr = self.devicePixelRatioF()
+        pixmap = QPixmap(int(self.width() * dpr), int(self.height() * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)  # Rounded corners only
+        painter.setPen(self._glow_pen)
+        painter.setBrush(Qt.BrushStyle.NoBrush)
+        painter.drawRoundedRect(self.rect().adjusted(1, 1, -1, -1), 8, 8)
+        painter.end()
+        return pixmap
+    
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._glow_cache = None
 
 
 class MainToolbar(QWidget):
@@ -735,6 +987,10 @@ class MainToolbar(QWidget):
         """Get information about all placed dynamites"""
         return self.coc_toolbar.get_placed_dynamites()
     
+    def get_dynamites_near(self, position, radius):
+        """Get placed dynamites within radius of a position"""
+        return self.coc_toolbar.get_dynamites_near(position, radius)
+    
     def get_available_tools(self):
         """Get list of all available tools"""
         return self.coc_toolbar.get_tools()
\ No newline at end of file
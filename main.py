@@ -1,8 +1,12 @@
 import sys
 from PyQt6.QtWidgets import QApplication, QStyleFactory
+from PyQt6.QtCore import Qt
 from core.app_window import RockfallApp
 
 if __name__ == "__main__":
+    # Keep fractional scale factors (e.g. 1.25, 1.5) so cached meter pixmaps
+    # are rendered at the real device pixel ratio; must be set before QApplication
+    QApplication.setHighDpiScaleFactorRoundingPolicy(Qt.HighDpiScaleFactorRoundingPolicy.PassThrough)
     app = QApplication(sys.argv)
     app.setStyle(QStyleFactory.create("Fusion"))
     window = RockfallApp()
@@ -1,9 +1,64 @@
 # circular_meter.py
 # Advanced compact circular risk meter widget for PyQt6
 
+from collections import OrderedDict
+from weakref import WeakSet
+
 from PyQt6.QtWidgets import QWidget
-from PyQt6.QtCore import Qt, QRectF, QSize
-from PyQt6.QtGui import QPainter, QPen, QFont, QColor
+from PyQt6.QtCore import Qt, QRect, QRectF, QSize, QPointF, QObject, QTimer
+from PyQt6.QtGui import QPainter, QPen, QBrush, QFont, QColor, QFontMetrics, QRegion, QPixmap, QPainterPath
+
+# Rendered meter frames kept per widget, least recently used evicted first
+FRAME_CACHE_SIZE = 128
+
+# All meters repaint together at most this often (~30 Hz)
+PAINT_INTERVAL_MS = 33
+
+# Every label the meter can show, "0%" … "100%"
+_PCT_STRINGS = tuple(f"{i}%" for i in range(101))
+
+# Risk colors indexed by color bucket: green (<40%), orange (40–70%), red (>=70%)
+_COLORS = (QColor(38, 139, 34), QColor(203, 152, 0), QColor(220, 50, 47))
+
+
+class _MeterPaintScheduler(QObject):
+    """One shared tick that repaints every CircularMeter whose value changed."""
+
+    def __init__(self):
+        super().__init__()
+        self._meters = WeakSet()
+        self._timer = QTimer(self)
+        self._timer.setInterval(PAINT_INTERVAL_MS)
+        self._timer.timeout.connect(self._tick)
+
+    def register(self, meter):
+        self._meters.add(meter)
+
+    def unregister(self, meter):
+        self._meters.discard(meter)
+
+    def request_paint(self):
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _tick(self):
+        for meter in list(self._meters):
+            try:
+                meter._flush_dirty()
+            except RuntimeError:
+                self._meters.discard(meter)  # C++ widget already deleted
+        self._timer.stop()  # Restarted by the next setValue
+
+
+_scheduler = None
+
+
+def _paint_scheduler() -> _MeterPaintScheduler:
+    """Shared scheduler, created with the first meter (a QTimer needs the app's thread)."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = _MeterPaintScheduler()
+    return _scheduler
 
 
 class CircularMeter(QWidget):
@@ -14,59 +69,198 @@ class CircularMeter(QWidget):
         - Green for low (<40%)
         - Orange for medium (40–70%)
         - Red for high (>70%)
+    Pass an opaque `background` color matching the parent when the meter sits
+    on a solid fill; Qt can then skip painting the parent underneath it.
     """
 
-    def __init__(self, parent=None, diameter: int = 100):
+    def __init__(self, parent=None, diameter: int = 100, background: QColor = None):
         super().__init__(parent)
         self._value = 0.0  # 0.0 to 1.0 normalized
+        self._pct = 0       # displayed integer percentage
+        self._span_16 = 0   # foreground arc span in 1/16 degree
+        self._bucket = 0    # color bucket: 0 green, 1 orange, 2 red
+        self._dirty = QRegion()  # area awaiting the next shared paint tick
         self._diameter = diameter
+        self._bg_color = background if background is not None and background.alpha() == 255 else None
+        self._text_pen = QPen(QColor(255, 255, 255))   # white
+        self._bg_brush = QBrush(QColor(200, 200, 200))
+        self._fg_brush = QBrush(QColor(0, 0, 0))
+        self._build_paint_resources()
         self.setFixedSize(diameter, diameter)
 
+        # Transparent corners need the parent painted underneath unless a solid
+        # background is baked into the cached frames; either way the contents
+        # are anchored top-left so Qt can keep pixels across resizes
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent, self._bg_color is not None)
+        self.setAutoFillBackground(False)
+        self.setAttribute(Qt.WidgetAttribute.WA_StaticContents, True)
+
+        _paint_scheduler().register(self)
+
+    def _build_paint_resources(self):
+        """(Re)create the size-dependent ring path, font and arc rect for the current diameter."""
+        d = self._diameter
+        self._pen_w = int(d * 0.10)
+        self._font_pt = int(d * 0.22)
+        self._arc_rect = QRectF(5, 5, d - 10, d - 10)
+
+        # The ring is a filled donut (outer minus inner ellipse) rather than a
+        # thick stroked arc; the foreground is the donut cut down to a wedge
+        half_w = self._pen_w / 2
+        self._ring_outer = self._arc_rect.adjusted(-half_w, -half_w, half_w, half_w)
+        self._ring_path = QPainterPath()
+        self._ring_path.setFillRule(Qt.FillRule.OddEvenFill)
+        self._ring_path.addEllipse(self._ring_outer)
+        self._ring_path.addEllipse(self._arc_rect.adjusted(half_w, half_w, -half_w, -half_w))
+
+        self._font = QFont()
+        self._font.setPointSize(self._font_pt)
+        self._font.setBold(True)
+
+        # Dirty areas: the ring band the arcs are stroked in, and the box the
+        # widest percentage text ("100%") occupies at the center
+        half_pen = self._pen_w // 2 + 1
+        ring = self._arc_rect.toAlignedRect()
+        outer = ring.adjusted(-half_pen, -half_pen, half_pen, half_pen)
+        inner = ring.adjusted(half_pen, half_pen, -half_pen, -half_pen)
+        self._arc_dirty_region = (QRegion(outer, QRegion.RegionType.Ellipse)
+                                  .subtracted(QRegion(inner, QRegion.RegionType.Ellipse)))
+
+        self._fm = QFontMetrics(self._font)
+        text_w, text_h = self._fm.horizontalAdvance("100%") + 2, self._fm.height()
+        self._text_rect = QRect((d - text_w) // 2, (d - text_h) // 2, text_w, text_h)
+        self._update_text_pos()
+
+        self._bg_pixmap = self._render_background()
+        self._frame_cache = OrderedDict()  # (span_16, bucket, pct) -> full meter QPixmap
+
+    def _update_text_pos(self):
+        """Baseline origin that centers the current percentage label."""
+        d = self._diameter
+        fm = self._fm
+        self._text_pos = QPointF((d - fm.horizontalAdvance(_PCT_STRINGS[self._pct])) / 2,
+                                 (d + fm.ascent() - fm.descent()) / 2)
+
+    def _render_background(self) -> QPixmap:
+        """Rasterize the static grey 360° background arc (and solid background, if any) once."""
+        d = self._diameter
+        dpr = self.devicePixelRatioF()
+        pixmap = QPixmap(int(d * dpr), int(d * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(self._bg_color if self._bg_color is not None else Qt.GlobalColor.transparent)
+
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.fillPath(self._ring_path, self._bg_brush)
+        painter.end()
+        return pixmap
+
+    def resizeEvent(self, event):
+        d = min(self.width(), self.height())
+        if d != self._diameter:
+            self._diameter = d
+            self._build_paint_resources()
+        super().resizeEvent(event)
+
     def sizeHint(self) -> QSize:
         return QSize(self._diameter, self._diameter)
 
     def setValue(self, value: float):
         """
         Set the risk value (normalized between 0.0 and 1.0).
-        Automatically repaints the widget.
+        Schedules a repaint on the shared tick only if the displayed percentage,
+        arc or color changes.
         """
         self._value = max(0.0, min(1.0, float(value)))
-        self.update()
+
+        pct = int(round(self._value * 100))
+        span_16 = -int(self._value * 360) * 16  # clockwise
+        bucket = self._color_bucket(self._value)
+        if pct == self._pct and span_16 == self._span_16 and bucket == self._bucket:
+            return
+
+        # Repaint only the parts that changed: the ring band and/or the text box
+        if span_16 != self._span_16 or bucket != self._bucket:
+            self._dirty = self._dirty.united(self._arc_dirty_region)
+        pct_changed = pct != self._pct
+        if pct_changed:
+            self._dirty = self._dirty.united(QRegion(self._text_rect))
+        self._pct, self._span_16, self._bucket = pct, span_16, bucket
+        if pct_changed:
+            self._update_text_pos()
+
+        _paint_scheduler().request_paint()
+
+    def _flush_dirty(self):
+        """Called by the shared paint tick: invalidate whatever changed since the last tick."""
+        if self._dirty.isEmpty():
+            return
+        dirty, self._dirty = self._dirty, QRegion()
+        # Hidden or fully covered meters are painted from this state when exposed
+        if self.isVisible() and not self.visibleRegion().isEmpty():
+            self.update(dirty)
+
+    def closeEvent(self, event):
+        _paint_scheduler().unregister(self)
+        super().closeEvent(event)
 
     def paintEvent(self, event):
-        d = self._diameter
+        if self._bg_pixmap.devicePixelRatio() != self.devicePixelRatioF():
+            # Moved to a screen with another DPR: every cached raster is stale
+            self._bg_pixmap = self._render_background()
+            self._frame_cache.clear()
+
+        key = (self._span_16, self._bucket, self._pct)
+        frame = self._frame_cache.get(key)
+        if frame is None:
+            frame = self._render_frame()
+            self._frame_cache[key] = frame
+            if len(self._frame_cache) > FRAME_CACHE_SIZE:
+                self._frame_cache.popitem(last=False)
+        else:
+            self._frame_cache.move_to_end(key)
+
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.drawPixmap(0, 0, frame)
+
+    def _render_frame(self) -> QPixmap:
+        """Rasterize the complete meter (background, arc and text) for the current value."""
+        d = self._diameter
+        dpr = self._bg_pixmap.devicePixelRatio()
+        pixmap = QPixmap(int(d * dpr), int(d * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(pixmap)
 
         # ---------- Background Arc ----------
-        pen_bg = QPen(QColor(200, 200, 200), int(d * 0.10))
-        painter.setPen(pen_bg)
-        painter.drawArc(QRectF(5, 5, d - 10, d - 10), 0, 360 * 16)
+        # Already antialiased when it was cached; a 1:1 blit needs no hints
+        painter.drawPixmap(0, 0, self._bg_pixmap)
 
         # ---------- Foreground Arc ----------
-        pen_fg = QPen(self._get_color(), int(d * 0.10))
-        painter.setPen(pen_fg)
-
-        span_angle_degrees = int(self._value * 360)
-        start_angle = -90 * 16  # start at top
-        span = -span_angle_degrees * 16  # clockwise
-        painter.drawArc(QRectF(5, 5, d - 10, d - 10), start_angle, span)
+        if self._span_16:
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing, True)
+            wedge = QPainterPath()
+            wedge.moveTo(self._ring_outer.center())
+            wedge.arcTo(self._ring_outer, -90, self._span_16 / 16)  # from -90°, clockwise
+            wedge.closeSubpath()
+            self._fg_brush.setColor(self._get_color())
+            painter.fillPath(self._ring_path.intersected(wedge), self._fg_brush)
 
         # ---------- Percentage Text ----------
-        painter.setPen(QColor(255, 255, 255))   # white
-        font = QFont()
-        font.setPointSize(int(d * 0.22))
-        font.setBold(True)
-        painter.setFont(font)
-
-        pct_text = f"{int(round(self._value * 100))}%"
-        painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, pct_text)
+        # Glyphs are smoothed by text antialiasing, not by the geometry hint
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, False)
+        painter.setRenderHint(QPainter.RenderHint.TextAntialiasing, True)
+        painter.setPen(self._text_pen)
+        painter.setFont(self._font)
+        painter.drawText(self._text_pos, _PCT_STRINGS[self._pct])
+        painter.end()
+        return pixmap
 
     # helper: risk color
+    @staticmethod
+    def _color_bucket(value: float) -> int:
+        return (value >= 0.4) + (value >= 0.7)   # 0 green, 1 orange, 2 red
+
     def _get_color(self) -> QColor:
-        if self._value >= 0.7:
-            return QColor(220, 50, 47)   # red
-        elif self._value >= 0.4:
-            return QColor(203, 152, 0)   # orange
-        else:
-            return QColor(38, 139, 34)   # green
+        return _COLORS[self._bucket]
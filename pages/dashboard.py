@@ -1,26 +1,68 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QGridLayout
+from PyQt6.QtWidgets import QWidget, QLabel, QGridLayout
 from PyQt6.QtGui import QFont
+from PyQt6.QtCore import Qt, QTimer
+
+# Pending sensor/risk values are applied at most this often (~30 Hz)
+REFRESH_INTERVAL_MS = 33
 
 
 class DashboardPage(QWidget):
-    def __init__(self, sensors, risk_meter):
+    def __init__(self, gauges, risk_meter):
         super().__init__()
-        layout = QVBoxLayout(self)
+        self.gauges = list(gauges)  # in display order
+        self.risk_meter = risk_meter
+
+        # Latest queued update per widget; bursts collapse into one repaint per tick
+        self._pending = {}
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setInterval(REFRESH_INTERVAL_MS)
+        self._refresh_timer.setSingleShot(False)
+        self._refresh_timer.setTimerType(Qt.TimerType.CoarseTimer)
+        self._refresh_timer.timeout.connect(self._flush_pending)
+
+        # One grid for the whole page: title row, three gauges per row, risk meter last
+        grid = QGridLayout(self)
 
         title = QLabel("🤖Insights")
         title.setFont(QFont("Arial", 16, QFont.Weight.Bold))
         title.setStyleSheet("color: #00f9ff;")
-        layout.addWidget(title)
+        grid.addWidget(title, 0, 0, 1, 3)
+
+        # Populate in one batch so the page lays out once, not per gauge
+        self.setUpdatesEnabled(False)
+        for idx, gauge in enumerate(self.gauges):
+            grid.addWidget(gauge, 1 + idx // 3, idx % 3)
+        gauge_rows = (len(self.gauges) + 2) // 3
+        grid.addWidget(risk_meter, 1 + gauge_rows, 0, 1, 3)
+        self.setUpdatesEnabled(True)
+        self.updateGeometry()
+
+    def queue_update(self, widget, value):
+        """Queue widget.setValue(value) (e.g. the risk meter); applied on the next tick"""
+        self._queue(widget, widget.setValue, (value,))
+
+    def queue_reading(self, gauge, raw, min_v, max_v):
+        """Queue a raw sensor reading for a gauge; applied on the next tick"""
+        self._queue(gauge, gauge.update_value, (raw, min_v, max_v))
+
+    def _queue(self, widget, apply, args):
+        self._pending[widget] = (apply, args)
+        if self.isVisible() and not self._refresh_timer.isActive():
+            self._refresh_timer.start()
 
-        grid = QGridLayout()
-        row, col = 0, 0
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Catch up on everything queued while the page was hidden
+        self._flush_pending()
 
-        for sensor, (gauge, _) in sensors.items():
-            grid.addWidget(gauge, row, col)
-            col += 1
-            if col > 2:
-                col = 0
-                row += 1
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._refresh_timer.stop()
 
-        layout.addLayout(grid)
-        layout.addWidget(risk_meter)
+    def _flush_pending(self):
+        """Apply each widget's most recent value once, then idle until more arrive"""
+        pending, self._pending = self._pending, {}
+        for apply, args in pending.values():
+            apply(*args)
+        if not self._pending:
+            self._refresh_timer.stop()
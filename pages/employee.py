@@ -1,12 +1,16 @@
 # employee_page.py
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QFrame, QPushButton,
-    QLabel, QLineEdit, QTableWidget, QTableWidgetItem,
+    QLabel, QLineEdit, QTableView, QStyledItemDelegate,
     QHeaderView, QMessageBox, QDialog, QComboBox, QScrollArea
 )
-from PyQt6.QtGui import QFont, QPainter, QColor, QPen, QBrush
-from PyQt6.QtCore import Qt, pyqtSignal
+from PyQt6.QtGui import QFont, QPainter, QColor, QPen, QBrush, QPixmap
+from PyQt6.QtCore import Qt, pyqtSignal, QObject, QAbstractTableModel, QModelIndex, QEvent, QRect, QPoint, QTimer
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+import threading
 import pyrebase
+from requests.adapters import HTTPAdapter
 import time
 
 # Firebase configuration
@@ -20,10 +24,62 @@ FIREBASE_CONFIG = {
     "appId": "your-app-id"
 }
 
+EMPLOYEES_URL = FIREBASE_CONFIG["databaseURL"].rstrip('/') + "/employees"
+
+# Bursts of stream events / writes are coalesced into one table + stats refresh
+REFRESH_DEBOUNCE_MS = 80
+
+# pyrebase connects the stream on its own thread and never reports a failure;
+# without the initial snapshot by then, fall back to a regular load
+STREAM_SNAPSHOT_TIMEOUT_MS = 5000
+
+# Firebase writes run off the GUI thread; concurrent writes overlap their round trips
+WRITE_WORKERS = 10
+
+# Per-ID reads of a refresh get their own pool so they never queue behind writes
+# (or behind the load task that waits on them)
+FETCH_WORKERS = 8
+
+# One pyrebase app per process; its requests session keeps a keep-alive pool
+# sized for the write and fetch workers so ops reuse TLS connections
+_FB_APP = None
+_FB_DB = None
+
+def get_firebase_app():
+    global _FB_APP
+    if _FB_APP is None:
+        app = pyrebase.initialize_app(FIREBASE_CONFIG)
+        app.requests.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=WRITE_WORKERS + FETCH_WORKERS,
+                                                   max_retries=3))
+        _FB_APP = app
+    return _FB_APP
+
+def get_db():
+    """Shared database handle for the GUI thread"""
+    global _FB_DB
+    if _FB_DB is None:
+        _FB_DB = get_firebase_app().database()
+    return _FB_DB
+
+# action -> (busy status, success status, success dialog, error status, error verb)
+WRITE_MESSAGES = {
+    "save": ("Saving employee...", "Employee saved successfully!",
+             "Employee added successfully!", "Error saving employee", "save"),
+    "update": ("Updating employee...", "Employee updated successfully!",
+               "Employee updated successfully!", "Error updating employee", "update"),
+    "delete": ("Deleting employee...", "Employee deleted successfully!",
+               "Employee deleted successfully!", "Error deleting employee", "delete"),
+}
+
+class _WriteSignals(QObject):
+    done = pyqtSignal(str, str, bool, str)  # action, employee_id, ok, error
+    loaded = pyqtSignal(object, str)  # employees dict (None on failure), error
+
 class AnimatedEmployeeMeter(QWidget):
     def __init__(self, title="Employee Count"):
         super().__init__()
         self.value = 0
+        self._cache = None  # Rendered ring for the current value/size
         self.setMinimumSize(180, 180)
         
         # Use layout for better positioning
@@ -43,12 +99,26 @@ class AnimatedEmployeeMeter(QWidget):
         layout.addWidget(self.count_label)
 
     def setValue(self, count):
+        if count == self.value:
+            return
         self.value = count
+        self._cache = None
         self.count_label.setText(f"{count}")
         self.update()
 
     def paintEvent(self, event):
-        painter = QPainter(self)
+        dpr = self.devicePixelRatioF()
+        if (self._cache is None or self._cache.devicePixelRatio() != dpr or
+                self._cache.deviceIndependentSize().toSize() != self.size()):
+            self._cache = self.render_ring(dpr)
+        QPainter(self).drawPixmap(0, 0, self._cache)
+
+    def render_ring(self, dpr):
+        pixmap = QPixmap(int(self.width() * dpr), int(self.height() * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+
+        painter = QPainter(pixmap)
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         rect = self.rect()
         size = min(rect.width(), rect.height()) - 20
@@ -70,6 +140,121 @@ class AnimatedEmployeeMeter(QWidget):
 
         painter.setPen(QPen(QColor(0, 249, 255, 80), 3))
         painter.drawEllipse(center, size // 2 + 5, size // 2 + 5)
+        painter.end()
+        return pixmap
+
+class EmployeeTableModel(QAbstractTableModel):
+    """Read-only table model over the employees dict; the view only asks for visible cells"""
+    HEADERS = ["ID", "Name", "Phone", "Region", "Department", "Actions"]
+    FIELDS = (None, 'name', 'phone', 'region', 'department')
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows = []  # [(emp_id, emp_data)], emp_data shared with EmployeePage.employees
+
+    def set_employees(self, employees):
+        self.beginResetModel()
+        self._rows = list(employees.items())
+        self.endResetModel()
+
+    def employee_id(self, row):
+        return self._rows[row][0]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        emp_id, emp_data = self._rows[index.row()]
+        col = index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            if col == 0:
+                # Employee ID (shortened for display)
+                return emp_id[:8] + "..." if len(emp_id) > 8 else emp_id
+            if col < len(self.FIELDS):
+                return emp_data.get(self.FIELDS[col], '')
+        elif role == Qt.ItemDataRole.ToolTipRole and col == 0:
+            return emp_id  # Show full ID on hover
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+class EmployeeActionsDelegate(QStyledItemDelegate):
+    """Paints Edit/Delete buttons in the Actions column and turns clicks on them into signals"""
+    editRequested = pyqtSignal(str)
+    deleteRequested = pyqtSignal(str)
+
+    EDIT_BRUSH = QBrush(QColor("#2a5c2a"))
+    DELETE_BRUSH = QBrush(QColor("#5c2a2a"))
+    TEXT_COLOR = QColor("white")
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.font = QFont()
+        self.font.setPixelSize(10)
+        # Every Actions cell has the same size, so the button pair is rendered
+        # once and blitted per row; keyed by (width, height, dpr)
+        self._button_cache = {}
+
+    @staticmethod
+    def button_rects(cell):
+        inner = cell.adjusted(4, 4, -4, -4)
+        edit_rect = QRect(inner.left(), inner.top(), 60, inner.height())
+        delete_rect = QRect(edit_rect.right() + 5, inner.top(), 70, inner.height())
+        return edit_rect, delete_rect
+
+    def paint(self, painter, option, index):
+        super().paint(painter, option, index)  # Background, selection and hover
+        painter.drawPixmap(option.rect.topLeft(),
+                           self.button_pixmap(option.rect.size(), painter.device().devicePixelRatioF()))
+
+    def button_pixmap(self, size, dpr):
+        key = (size.width(), size.height(), dpr)
+        pixmap = self._button_cache.get(key)
+        if pixmap is None:
+            if len(self._button_cache) >= 8:
+                self._button_cache.clear()
+            pixmap = self._button_cache[key] = self.render_buttons(size, dpr)
+        return pixmap
+
+    def render_buttons(self, size, dpr):
+        pixmap = QPixmap(int(size.width() * dpr), int(size.height() * dpr))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.GlobalColor.transparent)
+
+        edit_rect, delete_rect = self.button_rects(QRect(QPoint(0, 0), size))
+        painter = QPainter(pixmap)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setFont(self.font)
+        for rect, brush, text in ((edit_rect, self.EDIT_BRUSH, "✏️ Edit"),
+                                  (delete_rect, self.DELETE_BRUSH, "🗑️ Delete")):
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(brush)
+            painter.drawRoundedRect(rect, 3, 3)
+            painter.setPen(self.TEXT_COLOR)
+            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, text)
+        painter.end()
+        return pixmap
+
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QEvent.Type.MouseButtonRelease and
+                event.button() == Qt.MouseButton.LeftButton):
+            edit_rect, delete_rect = self.button_rects(option.rect)
+            pos = event.position().toPoint()
+            if edit_rect.contains(pos):
+                self.editRequested.emit(model.employee_id(index.row()))
+                return True
+            if delete_rect.contains(pos):
+                self.deleteRequested.emit(model.employee_id(index.row()))
+                return True
+        return super().editorEvent(event, model, option, index)
 
 class EmployeeFormDialog(QDialog):
     def __init__(self, parent=None, employee_data=None):
@@ -233,21 +418,125 @@ class EmployeeFormDialog(QDialog):
         }
 
 class EmployeePage(QWidget):
+    # Firebase stream callbacks arrive on pyrebase's thread; re-emitted here for the GUI thread
+    streamEvent = pyqtSignal(dict)
+
     def __init__(self):
         super().__init__()
+        self.stream = None
+        self.firebase_app = None
         self.firebase = self.initialize_firebase()
         self.employees = {}
+        self._region_counts = Counter()  # region -> employees, kept in step with self.employees
+        self._pool = ThreadPoolExecutor(max_workers=WRITE_WORKERS, thread_name_prefix="employee-write")
+        self._fetch_pool = ThreadPoolExecutor(max_workers=FETCH_WORKERS, thread_name_prefix="employee-fetch")
+        self._thread_state = threading.local()
+        self.signals = _WriteSignals()
+        self.signals.done.connect(self._on_write_done)
+        self.signals.loaded.connect(self._on_loaded)
+        self._loading = False
+        self._reload_full = False  # A full reload was requested while a load was in flight
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setSingleShot(True)
+        self._refresh_timer.setInterval(REFRESH_DEBOUNCE_MS)
+        self._refresh_timer.timeout.connect(self._do_refresh)
+        self._snapshot_timer = QTimer(self)
+        self._snapshot_timer.setSingleShot(True)
+        self._snapshot_timer.setInterval(STREAM_SNAPSHOT_TIMEOUT_MS)
+        self._snapshot_timer.timeout.connect(self._on_snapshot_timeout)
         self.setup_ui()
-        self.load_employees()
+        # The stream's first event is a full snapshot (put at "/"), so a separate
+        # initial load is only needed when the stream could not be started
+        if not self.start_stream():
+            self.load_employees()
 
     def initialize_firebase(self):
         try:
-            firebase = pyrebase.initialize_app(FIREBASE_CONFIG)
-            return firebase.database()
+            self.firebase_app = get_firebase_app()
+            return get_db()
         except Exception as e:
             print(f"Firebase initialization error: {e}")
             return None
 
+    def start_stream(self):
+        """Subscribe once to /employees so remote changes arrive as deltas instead of refetches"""
+        if not self.firebase:
+            return False
+        self.streamEvent.connect(self._apply_stream_event)
+        try:
+            self.stream = self.firebase.child("employees").stream(self._on_stream_event)
+        except Exception as e:
+            print(f"Firebase stream error: {e}")
+            self.stream = None
+            return False
+        self.status_label.setText("Loading employees...")
+        self.status_label.setStyleSheet("color: #ffcc00;")
+        self._snapshot_timer.start()
+        return True
+
+    def _on_snapshot_timeout(self):
+        print("Firebase stream sent no snapshot, loading employees directly")
+        self.load_employees()
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
+        self._fetch_pool.shutdown(wait=False)
+        if self.stream:
+            # Stream.close() waits for the SSE client to exist and then joins the stream
+            # thread, which hangs the GUI when it never connected; stop the client directly
+            sse = getattr(self.stream, 'sse', None)
+            if sse is not None:
+                try:
+                    sse.running = False
+                    sse.close()
+                except Exception as e:
+                    print(f"Error closing Firebase stream: {e}")
+            self.stream = None
+
+    def _on_stream_event(self, message):
+        # Runs on the stream thread - only hand the message over
+        self.streamEvent.emit(message)
+
+    def _apply_stream_event(self, message):
+        event = message.get('event')
+        if event not in ('put', 'patch'):
+            return  # keep-alive / cancel / auth_revoked
+        path = [part for part in (message.get('path') or '/').split('/') if part]
+        data = message.get('data')
+
+        if event == 'put' and not path:
+            self._snapshot_timer.stop()
+            self.set_all_employees(data or {})
+            self.refresh_views()
+            self.status_label.setText(f"Loaded {len(self.employees)} employees")
+            self.status_label.setStyleSheet("color: #00ff99;")
+            return
+
+        touched = [path[0]] if path else list(data or {})
+        self._count_regions(touched, -1)
+        if event == 'put':
+            if len(path) == 1:
+                if data is None:
+                    self.employees.pop(path[0], None)
+                else:
+                    self.employees[path[0]] = data
+            else:
+                emp_data = self.employees.setdefault(path[0], {})
+                if data is None:
+                    emp_data.pop(path[1], None)
+                else:
+                    emp_data[path[1]] = data
+        else:
+            target = self.employees.setdefault(path[0], {}) if path else self.employees
+            for key, value in (data or {}).items():
+                if value is None:
+                    target.pop(key, None)
+                else:
+                    target[key] = value
+        self._count_regions(touched, 1)
+
+        self.refresh_views()
+
     def setup_ui(self):
         layout = QHBoxLayout(self)
         layout.setSpacing(10)
@@ -309,7 +598,7 @@ class EmployeePage(QWidget):
                 background-color: #3a5a4a;
             }
         """)
-        self.refresh_btn.clicked.connect(self.load_employees)
+        self.refresh_btn.clicked.connect(lambda: self.load_employees())
 
         control_layout.addWidget(self.add_btn)
         control_layout.addWidget(self.refresh_btn)
@@ -329,19 +618,30 @@ class EmployeePage(QWidget):
         table_layout = QVBoxLayout(table_frame)
         table_layout.setContentsMargins(8, 8, 8, 8)
 
-        self.employee_table = QTableWidget()
-        self.employee_table.setColumnCount(6)
-        self.employee_table.setHorizontalHeaderLabels(["ID", "Name", "Phone", "Region", "Department", "Actions"])
+        self.employee_model = EmployeeTableModel(self)
+        self.employee_table = QTableView()
+        self.employee_table.setModel(self.employee_model)
+        
+        # Edit/Delete are painted by a delegate instead of two QPushButtons per row;
+        # queued so the dialogs open after the click has been fully handled
+        self.actions_delegate = EmployeeActionsDelegate(self.employee_table)
+        self.actions_delegate.editRequested.connect(self.edit_employee, Qt.ConnectionType.QueuedConnection)
+        self.actions_delegate.deleteRequested.connect(self.delete_employee, Qt.ConnectionType.QueuedConnection)
+        self.employee_table.setItemDelegateForColumn(5, self.actions_delegate)
+        # Fixed row heights and column widths: the view never measures cell contents
+        # to size sections, so layout cost does not grow with the row count
+        self.employee_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.employee_table.verticalHeader().setDefaultSectionSize(40)  # Consistent row height
         
         # Better table styling and behavior
-        self.employee_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        self.employee_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
         self.employee_table.horizontalHeader().setStretchLastSection(True)
         self.employee_table.setAlternatingRowColors(True)
-        self.employee_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.employee_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.employee_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.employee_table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
         
         self.employee_table.setStyleSheet("""
-            QTableWidget {
+            QTableView {
                 background-color: rgba(30,40,60,0.6);
                 border: none;
                 border-radius: 6px;
@@ -349,11 +649,11 @@ class EmployeePage(QWidget):
                 gridline-color: #2a3a4a;
                 font-size: 11px;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 6px;
                 border-bottom: 1px solid #2a3a4a;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: rgba(0, 249, 255, 0.3);
                 color: white;
             }
@@ -365,7 +665,7 @@ class EmployeePage(QWidget):
                 border: none;
                 font-size: 11px;
             }
-            QTableWidget::item:hover {
+            QTableView::item:hover {
                 background-color: rgba(0, 249, 255, 0.1);
             }
         """)
@@ -472,116 +772,147 @@ class EmployeePage(QWidget):
         return True
 
     def save_employee(self, employee_data):
+        # Generate unique ID
+        employee_id = f"emp_{int(time.time() * 1000)}"
+        if self.submit_write("save", employee_id,
+                             lambda db: db.child("employees").child(employee_id).set(employee_data)):
+            # Optimistic local update - the stream confirms it
+            self._count_regions([employee_id], -1)
+            self.employees[employee_id] = employee_data
+            self._count_regions([employee_id], 1)
+            self.refresh_views()
+
+    def submit_write(self, action, employee_id, write):
+        """Run write(db) on the pool; the result comes back through signals.done"""
+        if not self.firebase:
+            QMessageBox.warning(self, "Error", "Database connection failed")
+            return False
+        self.status_label.setText(WRITE_MESSAGES[action][0])
+        self.status_label.setStyleSheet("color: #ffcc00;")
+        self._pool.submit(self._run_write, action, employee_id, write)
+        return True
+
+    def _worker_db(self):
+        # pyrebase builds the child() path on the handle itself, so every worker thread
+        # gets its own handle; they all share the app and its HTTP session
+        db = getattr(self._thread_state, 'db', None)
+        if db is None:
+            db = self._thread_state.db = self.firebase_app.database()
+        return db
+
+    def _run_write(self, action, employee_id, write):
         try:
-            if self.firebase:
-                self.status_label.setText("Saving employee...")
-                self.status_label.setStyleSheet("color: #ffcc00;")
-                
-                # Generate unique ID
-                employee_id = f"emp_{int(time.time() * 1000)}"
-                
-                # Save to Firebase
-                self.firebase.child("employees").child(employee_id).set(employee_data)
-                
-                self.status_label.setText("Employee saved successfully!")
-                self.status_label.setStyleSheet("color: #00ff99;")
-                
-                QMessageBox.information(self, "Success", "Employee added successfully!")
-                self.load_employees()
-            else:
-                QMessageBox.warning(self, "Error", "Database connection failed")
+            write(self._worker_db())
+            self.signals.done.emit(action, employee_id, True, "")
         except Exception as e:
-            self.status_label.setText("Error saving employee")
+            self.signals.done.emit(action, employee_id, False, str(e))
+
+    def _on_write_done(self, action, employee_id, ok, error):
+        _, ok_status, ok_dialog, error_status, verb = WRITE_MESSAGES[action]
+        if ok:
+            self.status_label.setText(ok_status)
+            self.status_label.setStyleSheet("color: #00ff99;")
+            QMessageBox.information(self, "Success", ok_dialog)
+        else:
+            self.status_label.setText(error_status)
             self.status_label.setStyleSheet("color: #ff4444;")
-            QMessageBox.critical(self, "Error", f"Failed to save employee: {str(e)}")
-
-    def load_employees(self):
+            QMessageBox.critical(self, "Error", f"Failed to {verb} employee: {error}")
+            # Roll back the optimistic local change; the cached rows hold it, so skip the shallow diff
+            self.load_employees(full=True)
+
+    def load_employees(self, full=False):
+        """full=True ignores the cached rows and downloads the whole collection"""
+        if not self.firebase:
+            self.set_all_employees({})
+            self.refresh_views()
+            self.status_label.setText("Database connection failed")
+            self.status_label.setStyleSheet("color: #ff4444;")
+            return
+        if self._loading:
+            # A load is already in flight; a full reload still has to run after it
+            self._reload_full = self._reload_full or full
+            return
+
+        self._loading = True
+        self.status_label.setText("Loading employees...")
+        self.status_label.setStyleSheet("color: #ffcc00;")
+        # Snapshot on the GUI thread; without a live stream the known rows may be stale
+        known = dict(self.employees) if self.stream and not full else {}
+        self._pool.submit(self._run_load, known)
+
+    def _run_load(self, known):
         try:
-            self.status_label.setText("Loading employees...")
-            self.status_label.setStyleSheet("color: #ffcc00;")
-            
-            if self.firebase:
-                employees_data = self.firebase.child("employees").get().val()
-                self.employees = employees_data or {}
-                self.update_employee_table()
-                self.update_stats()
-                
-                self.status_label.setText(f"Loaded {len(self.employees)} employees")
-                self.status_label.setStyleSheet("color: #00ff99;")
-            else:
-                self.employees = {}
-                self.status_label.setText("Database connection failed")
-                self.status_label.setStyleSheet("color: #ff4444;")
+            self.signals.loaded.emit(self.fetch_employees(known), "")
         except Exception as e:
-            print(f"Error loading employees: {e}")
-            self.employees = {}
+            self.signals.loaded.emit(None, str(e))
+
+    def _on_loaded(self, employees, error):
+        self._loading = False
+        if self._reload_full:
+            # This result may still hold a rolled-back optimistic row; drop it
+            self._reload_full = False
+            self.load_employees(full=True)
+            return
+        if employees is None:
+            print(f"Error loading employees: {error}")
+            self.set_all_employees({})
+            self.refresh_views()
             self.status_label.setText("Error loading data")
             self.status_label.setStyleSheet("color: #ff4444;")
+            return
+
+        self.set_all_employees(employees)
+        self.refresh_views()
+        self.status_label.setText(f"Loaded {len(self.employees)} employees")
+        self.status_label.setStyleSheet("color: #00ff99;")
+
+    def set_all_employees(self, employees):
+        self.employees = employees
+        self._region_counts = Counter(emp_data.get('region', 'Unknown')
+                                      for emp_data in employees.values() if emp_data)
+
+    def _count_regions(self, employee_ids, delta):
+        """Add delta to the region counts of the given employees, as they are now"""
+        for emp_id in employee_ids:
+            emp_data = self.employees.get(emp_id)
+            if emp_data:
+                region = emp_data.get('region', 'Unknown')
+                self._region_counts[region] += delta
+                if self._region_counts[region] <= 0:
+                    del self._region_counts[region]
+
+    def refresh_views(self):
+        self._refresh_timer.start()
+
+    def _do_refresh(self):
+        self.update_employee_table()
+        self.update_stats()
+
+    def fetch_employees(self, known):
+        """Runs on the pool. Cold cache: one full GET. Otherwise a shallow GET of the IDs,
+        keeping known rows (kept current by the stream) and fetching only new IDs in parallel"""
+        if not known:
+            return self._worker_db().child("employees").get().val() or {}
+
+        session = self.firebase_app.requests
+        res = session.get(f"{EMPLOYEES_URL}.json", params={"shallow": "true"})
+        res.raise_for_status()
+        ids = res.json() or {}
+
+        employees = {emp_id: known[emp_id] for emp_id in ids if emp_id in known}
+        new_ids = [emp_id for emp_id in ids if emp_id not in known]
+        for emp_id, emp_data in zip(new_ids, self._fetch_pool.map(self._fetch_employee, new_ids)):
+            if emp_data:
+                employees[emp_id] = emp_data
+        return employees
+
+    def _fetch_employee(self, employee_id):
+        res = self.firebase_app.requests.get(f"{EMPLOYEES_URL}/{employee_id}.json")
+        res.raise_for_status()
+        return res.json()
 
     def update_employee_table(self):
-        self.employee_table.setRowCount(0)
-        
-        for emp_id, emp_data in self.employees.items():
-            row = self.employee_table.rowCount()
-            self.employee_table.insertRow(row)
-            
-            # Employee ID (shortened for display)
-            short_id = emp_id[:8] + "..." if len(emp_id) > 8 else emp_id
-            self.employee_table.setItem(row, 0, QTableWidgetItem(short_id))
-            self.employee_table.item(row, 0).setToolTip(emp_id)  # Show full ID on hover
-            
-            # Employee Data
-            self.employee_table.setItem(row, 1, QTableWidgetItem(emp_data.get('name', '')))
-            self.employee_table.setItem(row, 2, QTableWidgetItem(emp_data.get('phone', '')))
-            self.employee_table.setItem(row, 3, QTableWidgetItem(emp_data.get('region', '')))
-            self.employee_table.setItem(row, 4, QTableWidgetItem(emp_data.get('department', '')))
-            
-            # Actions
-            actions_widget = QWidget()
-            actions_layout = QHBoxLayout(actions_widget)
-            actions_layout.setContentsMargins(4, 4, 4, 4)
-            actions_layout.setSpacing(4)
-            
-            edit_btn = QPushButton("✏️ Edit")
-            edit_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #2a5c2a;
-                    color: white;
-                    border: none;
-                    border-radius: 3px;
-                    padding: 4px 6px;
-                    font-size: 10px;
-                    min-width: 40px;
-                }
-                QPushButton:hover {
-                    background-color: #3a6c3a;
-                }
-            """)
-            edit_btn.clicked.connect(lambda checked, eid=emp_id: self.edit_employee(eid))
-            
-            delete_btn = QPushButton("🗑️ Delete")
-            delete_btn.setStyleSheet("""
-                QPushButton {
-                    background-color: #5c2a2a;
-                    color: white;
-                    border: none;
-                    border-radius: 3px;
-                    padding: 4px 6px;
-                    font-size: 10px;
-                    min-width: 50px;
-                }
-                QPushButton:hover {
-                    background-color: #6c3a3a;
-                }
-            """)
-            delete_btn.clicked.connect(lambda checked, eid=emp_id: self.delete_employee(eid))
-            
-            actions_layout.addWidget(edit_btn)
-            actions_layout.addWidget(delete_btn)
-            actions_layout.addStretch()
-            
-            self.employee_table.setCellWidget(row, 5, actions_widget)
-            self.employee_table.setRowHeight(row, 40)  # Consistent row height
+        self.employee_model.set_employees(self.employees)
 
     def update_stats(self):
         # Update employee count
@@ -589,18 +920,9 @@ class EmployeePage(QWidget):
         self.employee_meter.setValue(count)
         
         # Update region distribution
-        regions = {}
-        for emp_data in self.employees.values():
-            region = emp_data.get('region', 'Unknown')
-            regions[region] = regions.get(region, 0) + 1
-        
-        if regions:
-            region_text = ""
-            for region, count in sorted(regions.items()):
-                region_text += f"• {region}: {count} employee(s)\n"
-            self.region_label.setText(region_text.strip())
-        else:
-            self.region_label.setText("No employees found")
+        region_text = "\n".join(f"• {region}: {count} employee(s)"
+                                for region, count in sorted(self._region_counts.items()))
+        self.region_label.setText(region_text or "No employees found")
 
     def edit_employee(self, employee_id):
         employee_data = self.employees.get(employee_id)
@@ -612,24 +934,12 @@ class EmployeePage(QWidget):
                     self.update_employee(employee_id, updated_data)
 
     def update_employee(self, employee_id, employee_data):
-        try:
-            if self.firebase:
-                self.status_label.setText("Updating employee...")
-                self.status_label.setStyleSheet("color: #ffcc00;")
-                
-                self.firebase.child("employees").child(employee_id).update(employee_data)
-                
-                self.status_label.setText("Employee updated successfully!")
-                self.status_label.setStyleSheet("color: #00ff99;")
-                
-                QMessageBox.information(self, "Success", "Employee updated successfully!")
-                self.load_employees()
-            else:
-                QMessageBox.warning(self, "Error", "Database connection failed")
-        except Exception as e:
-            self.status_label.setText("Error updating employee")
-            self.status_label.setStyleSheet("color: #ff4444;")
-            QMessageBox.critical(self, "Error", f"Failed to update employee: {str(e)}")
+        if self.submit_write("update", employee_id,
+                             lambda db: db.child("employees").child(employee_id).update(employee_data)):
+            self._count_regions([employee_id], -1)
+            self.employees.setdefault(employee_id, {}).update(employee_data)
+            self._count_regions([employee_id], 1)
+            self.refresh_views()
 
     def delete_employee(self, employee_id):
         employee_name = self.employees.get(employee_id, {}).get('name', 'this employee')
@@ -641,21 +951,8 @@ class EmployeePage(QWidget):
         )
         
         if reply == QMessageBox.StandardButton.Yes:
-            try:
-                if self.firebase:
-                    self.status_label.setText("Deleting employee...")
-                    self.status_label.setStyleSheet("color: #ffcc00;")
-                    
-                    self.firebase.child("employees").child(employee_id).remove()
-                    
-                    self.status_label.setText("Employee deleted successfully!")
-                    self.status_label.setStyleSheet("color: #00ff99;")
-                    
-                    QMessageBox.information(self, "Success", "Employee deleted successfully!")
-                    self.load_employees()
-                else:
-                    QMessageBox.warning(self, "Error", "Database connection failed")
-            except Exception as e:
-                self.status_label.setText("Error deleting employee")
-                self.status_label.setStyleSheet("color: #ff4444;")
-                QMessageBox.critical(self, "Error", f"Failed to delete employee: {str(e)}")
\ No newline at end of file
+            if self.submit_write("delete", employee_id,
+                                 lambda db: db.child("employees").child(employee_id).remove()):
+                self._count_regions([employee_id], -1)
+                self.employees.pop(employee_id, None)
+                self.refresh_views()
@@ -10,7 +10,7 @@ from PyQt6.QtWidgets import (
     QLabel, QFileDialog, QDialog, QMessageBox
 )
 from PyQt6.QtGui import QFont, QPainter, QColor, QPen, QBrush
-from PyQt6.QtCore import Qt, QTimer
+from PyQt6.QtCore import Qt, QTimer, QObject, QRunnable, QThreadPool, pyqtSignal
 import pyrebase
 import time
 import atexit
@@ -85,6 +85,60 @@ class FirebaseManager:
         except Exception as e:
             print(f"Error saving region data: {e}")
 
+# =====================================================================================================
+# Background Mesh Loader
+# =====================================================================================================
+_mesh_cache = {}  # (path, mtime) -> trimesh.Trimesh
+
+def load_mesh_file(path):
+    """Parse a mesh file with trimesh; re-opening an unchanged file is served from cache"""
+    key = (os.path.abspath(path), os.path.getmtime(path))
+    mesh = _mesh_cache.get(key)
+    if mesh is None:
+        import trimesh
+        mesh = trimesh.load(path)
+        if not isinstance(mesh, trimesh.Trimesh):
+            mesh = mesh.dump(concatenate=True)
+        _mesh_cache.clear()  # keep only the latest mesh alive
+        _mesh_cache[key] = mesh
+    return mesh
+
+class MeshLoadSignals(QObject):
+    meshReady = pyqtSignal(str, object)  # path, trimesh.Trimesh
+    meshFailed = pyqtSignal(str, str)    # path, error message
+
+class MeshLoadTask(QRunnable):
+    """Loads a mesh on a QThreadPool worker so file parsing never blocks the GUI"""
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+        self.signals = MeshLoadSignals()
+
+    def run(self):
+        try:
+            mesh = load_mesh_file(self.path)
+        except Exception as e:
+            self.signals.meshFailed.emit(self.path, str(e))
+            return
+        self.signals.meshReady.emit(self.path, mesh)
+
+class GnnAnalysisSignals(QObject):
+    finished = pyqtSignal(object, object, object, str)  # points, scores, indices, message
+
+class GnnAnalysisTask(QRunnable):
+    """Runs the GNN stress analysis (edge build, Data build, forward) off the GUI thread"""
+    def __init__(self, analyze):
+        super().__init__()
+        self.analyze = analyze
+        self.signals = GnnAnalysisSignals()
+
+    def run(self):
+        try:
+            result = self.analyze()
+        except Exception as e:
+            result = (None, None, None, f"GNN analysis error: {e}")
+        self.signals.finished.emit(*result)
+
 # =====================================================================================================
 # Region Manager
 # =====================================================================================================
@@ -427,7 +481,7 @@ class StressAnalysisPage(QWidget):
             self.debug_node_placement(self.gnn_top_points, "GNN Points")
 
     # ---------------- GNN DISTRIBUTION FIX ----------------
-    def get_better_distributed_gnn_points(self, vertices, faces, target_points=200):
+    def get_better_distributed_gnn_points(self, vertices, faces, target_points=200, mesh_bounds=None):
         """Run GNN multiple times with different parameters to get better distribution"""
         if self.gnn_analyzer is None or self.gnn_analyzer.model is None:
             return None, None, None, "GNN model not loaded"
@@ -449,20 +503,22 @@ class StressAnalysisPage(QWidget):
                 return None, None, None, message
             
             # Filter and distribute points across the mesh
-            distributed_points = self.distribute_points_across_mesh(top_points, top_scores, target_points)
+            distributed_points = self.distribute_points_across_mesh(top_points, top_scores, target_points, mesh_bounds)
             
             return distributed_points, top_scores[:len(distributed_points)], top_indices[:len(distributed_points)], "Success"
             
         except Exception as e:
             return None, None, None, f"Enhanced analysis failed: {str(e)}"
 
-    def distribute_points_across_mesh(self, points, scores, target_count):
-        """Distribute GNN points more evenly across the mesh while maintaining high scores"""
+    def distribute_points_across_mesh(self, points, scores, target_count, mesh_bounds=None):
+        """Distribute GNN points more evenly across the mesh while maintaining high scores.
+        Pass mesh_bounds when calling off the GUI thread (the VTK actor is not touched then)."""
         if len(points) <= target_count:
             return points[:target_count]
         
         # Get mesh bounds
-        mesh_bounds = self.mesh_actor.GetBounds() if self.mesh_actor else None
+        if mesh_bounds is None:
+            mesh_bounds = self.mesh_actor.GetBounds() if self.mesh_actor else None
         if mesh_bounds is None:
             return points[:target_count]
         
@@ -533,7 +589,7 @@ class StressAnalysisPage(QWidget):
         return distributed_points[:target_count]
 
     # ---------------- REGION-BASED ANALYSIS ----------------
-    def force_full_mesh_coverage(self, vertices, faces, target_points=200):
+    def force_full_mesh_coverage(self, vertices, faces, target_points=200, mesh_bounds=None):
         """Force GNN to analyze all regions of the mesh by splitting it into sections"""
         if self.gnn_analyzer is None or self.gnn_analyzer.model is None:
             return None, None, None, "GNN model not loaded"
@@ -542,7 +598,8 @@ class StressAnalysisPage(QWidget):
             print("🔄 Running region-based GNN analysis for full coverage...")
             
             # Get mesh bounds
-            mesh_bounds = self.mesh_actor.GetBounds() if self.mesh_actor else None
+            if mesh_bounds is None:
+                mesh_bounds = self.mesh_actor.GetBounds() if self.mesh_actor else None
             if mesh_bounds is None:
                 return None, None, None, "Mesh bounds not available"
             
@@ -632,13 +689,27 @@ class StressAnalysisPage(QWidget):
         f, _ = QFileDialog.getOpenFileName(self, "Select 3D Model", "", "3D Models (*.obj *.ply *.stl)")
         if not f:
             return
+        
+        # Parse the file on a worker thread; the VTK scene is built in on_mesh_loaded
+        self.node_info_label.setText("🔄 Loading 3D model...")
+        self.node_info_label.setStyleSheet("color:#ffcc00; padding:6px;")
+        self.model_btn.setEnabled(False)
+        self._mesh_task = MeshLoadTask(f)
+        self._mesh_task.signals.meshReady.connect(self.on_mesh_loaded)
+        self._mesh_task.signals.meshFailed.connect(self.on_mesh_load_failed)
+        QThreadPool.globalInstance().start(self._mesh_task)
+
+    def on_mesh_load_failed(self, path, error):
+        self.model_btn.setEnabled(True)
+        self.node_info_label.setText("❌ Failed to load 3D model")
+        self.node_info_label.setStyleSheet("color:#ff4444; padding:6px;")
+        print("Error loading 3D model:", error)
+
+    def on_mesh_loaded(self, f, mesh):
+        self.model_btn.setEnabled(True)
         try:
             self.current_mesh_path = f  # Store for GNN analysis
             
-            import trimesh
-            mesh = trimesh.load(f)
-            if not isinstance(mesh, trimesh.Trimesh):
-                mesh = mesh.dump(concatenate=True)
             self.vertices = mesh.vertices
             self.faces = mesh.faces
 
@@ -694,6 +765,8 @@ class StressAnalysisPage(QWidget):
             self.gnn_top_indices = None
             
             print(f"✅ Model loaded: {len(self.vertices)} vertices, {len(self.faces) if self.faces is not None else 0} faces")
+            self.node_info_label.setText("Right-click on a stress node to view info")
+            self.node_info_label.setStyleSheet("color:#ff9900; padding:6px;")
             
         except Exception as e:
             print("Error loading 3D model:", e)
@@ -715,94 +788,87 @@ class StressAnalysisPage(QWidget):
             self.add_stress_nodes_from_csv()  # Fallback to random
             return
         
+        # Check if we have vertices loaded
+        if self.vertices is None:
+            self.node_info_label.setText("❌ No vertices loaded from model")
+            self.node_info_label.setStyleSheet("color:#ff4444; padding:6px;")
+            self.add_stress_nodes_from_csv()
+            return
+        
         # Show processing message
         self.node_info_label.setText("🔄 Analyzing stress points with GNN...")
         self.node_info_label.setStyleSheet("color:#ffcc00; padding:6px;")
         
-        # Process in a way that doesn't freeze UI
-        QTimer.singleShot(100, self._perform_gnn_analysis)
+        # Edge building, Data construction and the forward pass run on a pool
+        # worker; VTK state is read here and results come back through a queued signal
+        self.analyze_btn.setEnabled(False)
+        vertices, faces = self.vertices, self.faces
+        mesh_bounds = self.mesh_actor.GetBounds() if self.mesh_actor else None
+        self._gnn_task = GnnAnalysisTask(
+            lambda: self._perform_gnn_analysis(vertices, faces, mesh_bounds))
+        self._gnn_task.signals.finished.connect(self.on_gnn_analysis_finished)
+        QThreadPool.globalInstance().start(self._gnn_task)
 
-    def _perform_gnn_analysis(self):
-        """Perform GNN analysis using already loaded vertices"""
+    def _perform_gnn_analysis(self, vertices, faces, mesh_bounds):
+        """Perform GNN analysis on the given vertices. Runs on a worker thread."""
         try:
-            # Check if we have vertices loaded
-            if self.vertices is None:
-                self.node_info_label.setText("❌ No vertices loaded from model")
-                self.node_info_label.setStyleSheet("color:#ff4444; padding:6px;")
-                self.add_stress_nodes_from_csv()
-                return
-            
-            print(f"🔄 Running GNN analysis on {len(self.vertices)} vertices...")
+            print(f"🔄 Running GNN analysis on {len(vertices)} vertices...")
             
             # FIRST: Try region-based analysis for full coverage
             print("🎯 Attempting region-based analysis for full mesh coverage...")
             top_points, top_scores, top_indices, message = self.force_full_mesh_coverage(
-                self.vertices, self.faces, target_points=200
+                vertices, faces, target_points=200, mesh_bounds=mesh_bounds
             )
             
             # SECOND: If region-based fails, try enhanced distribution
             if top_points is None:
                 print("🔄 Region-based failed, trying enhanced distribution...")
                 top_points, top_scores, top_indices, message = self.get_better_distributed_gnn_points(
-                    self.vertices, self.faces, target_points=200
+                    vertices, faces, target_points=200, mesh_bounds=mesh_bounds
                 )
             
             # THIRD: If enhanced distribution fails, try basic GNN
             if top_points is None:
                 print("🔄 Enhanced distribution failed, trying basic GNN...")
                 top_points, top_scores, top_indices, message = self.gnn_analyzer.analyze_vertices(
-                    self.vertices, self.faces, top_k=200
+                    vertices, faces, top_k=200
                 )
+            return top_points, top_scores, top_indices, message
             
-            if top_points is not None:
-                # DEBUG: Check what points we're getting
-                self.debug_node_placement(top_points, "Final GNN Analysis Result")
-                
-                # Store the GNN-selected points
-                self.gnn_top_points = top_points
-                self.gnn_top_indices = top_indices
-                
-                # Update visualization with GNN points
-                self.visualize_gnn_points(top_points)
-                
-                self.node_info_label.setText(f"✅ GNN analysis complete: {len(top_points)} critical points found")
-                self.node_info_label.setStyleSheet("color:#00ff99; padding:6px;")
-                
-                print(f"GNN Analysis: Found {len(top_points)} critical points")
-                
-                # Compare distributions
-                self.compare_point_distributions()
-                
-            else:
-                self.node_info_label.setText(f"❌ GNN analysis failed: {message}")
-                self.node_info_label.setStyleSheet("color:#ff4444; padding:6px;")
-                print(f"GNN analysis failed: {message}")
-                # Fallback to basic GNN analysis
-                self._fallback_gnn_analysis()
-                
         except Exception as e:
-            self.node_info_label.setText(f"❌ GNN analysis error: {str(e)}")
-            self.node_info_label.setStyleSheet("color:#ff4444; padding:6px;")
             print(f"GNN analysis error: {e}")
             # Fallback to basic GNN analysis
-            self._fallback_gnn_analysis()
-
-    def _fallback_gnn_analysis(self):
-        """Fallback to basic GNN analysis if enhanced method fails"""
-        try:
             top_points, top_scores, top_indices, message = self.gnn_analyzer.analyze_vertices(
-                self.vertices, self.faces, top_k=200
+                vertices, faces, top_k=200
             )
+            return top_points, top_scores, top_indices, message
+
+    def on_gnn_analysis_finished(self, top_points, top_scores, top_indices, message):
+        self.analyze_btn.setEnabled(True)
+        if top_points is not None:
+            # DEBUG: Check what points we're getting
+            self.debug_node_placement(top_points, "Final GNN Analysis Result")
             
-            if top_points is not None:
-                self.gnn_top_points = top_points
-                self.gnn_top_indices = top_indices
-                self.visualize_gnn_points(top_points)
-                self.node_info_label.setText(f"✅ Basic GNN analysis: {len(top_points)} points found")
-                print(f"Fallback GNN Analysis: Found {len(top_points)} critical points")
-            else:
-                self.add_stress_nodes_from_csv()
-        except Exception as e:
+            # Store the GNN-selected points
+            self.gnn_top_points = top_points
+            self.gnn_top_indices = top_indices
+            
+            # Update visualization with GNN points
+            self.visualize_gnn_points(top_points)
+            
+            self.node_info_label.setText(f"✅ GNN analysis complete: {len(top_points)} critical points found")
+            self.node_info_label.setStyleSheet("color:#00ff99; padding:6px;")
+            
+            print(f"GNN Analysis: Found {len(top_points)} critical points")
+            
+            # Compare distributions
+            self.compare_point_distributions()
+            
+        else:
+            self.node_info_label.setText(f"❌ GNN analysis failed: {message}")
+            self.node_info_label.setStyleSheet("color:#ff4444; padding:6px;")
+            print(f"GNN analysis failed: {message}")
+            # Fall back to random points
             self.add_stress_nodes_from_csv()
 
     def visualize_gnn_points(self, points):